@@ -1,6 +1,7 @@
 """Streamlit UI for batch downloading NSE company announcements."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 
@@ -9,8 +10,9 @@ import streamlit.components.v1 as components
 
 from knowledgelm.config import (
     DOWNLOAD_CATEGORIES_CONFIG,
+    ENABLED_ARG_BY_CATEGORY,
+    ISSUE_DOCS_CONFIG,
 )
-from knowledgelm.core.forum import ForumClient, PDFGenerator, ReferenceExtractor
 from knowledgelm.core.service import KnowledgeService
 from knowledgelm.utils.text_utils import pluralize
 
@@ -24,6 +26,54 @@ logging.basicConfig(
 )
 
 # --- Constants ---
+
+
+@st.cache_resource
+def get_service(base_path: str) -> KnowledgeService:
+    """Return a KnowledgeService shared across reruns and sessions.
+
+    Constructing the service builds an NSE client; caching it keeps that client
+    (and its connection pool) alive instead of rebuilding it on every click.
+    """
+    return KnowledgeService(base_path)
+
+
+def iter_summary_counts(category_counts: dict):
+    """Yield (label, count) pairs for the download summary in config order.
+
+    The service keys counts by category key (issue documents by sub-type label).
+    """
+    for cat_key, config in DOWNLOAD_CATEGORIES_CONFIG.items():
+        if cat_key == "issue_documents":
+            count = sum(category_counts.get(c["label"], 0) for c in ISSUE_DOCS_CONFIG.values())
+        else:
+            count = category_counts.get(cat_key, 0)
+        yield config["label"], count
+
+    yield "ValuePickr Thread", category_counts.get("ValuePickr Thread", 0)
+
+
+def export_forum_thread(forum_url: str, output_dir: Path) -> None:
+    """Save a ValuePickr thread as PDF plus an extracted links file.
+
+    Touches no Streamlit state, so it can run on a worker thread while NSE filings download.
+    The forum module (Selenium, BeautifulSoup) is imported here, on first use, so
+    sessions that never export a thread do not pay for loading it.
+    """
+    from knowledgelm.core.forum import ForumClient, PDFGenerator, ReferenceExtractor
+
+    client = ForumClient()
+    thread_data = client.get_full_thread(forum_url)
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with PDFGenerator() as generator:
+        generator.generate_thread_pdf(thread_data, output_dir / "forum_thread.pdf")
+
+    ref_extractor = ReferenceExtractor()
+    ref_content = ref_extractor.extract_references(thread_data)
+    (output_dir / "forum_links.md").write_text(ref_content, encoding="utf-8")
+
+
 # --- Session State Initialization ---
 if "data" not in st.session_state:
     st.session_state.data = None
@@ -56,44 +106,57 @@ with st.container(border=True):
         )
 
 # --- Filing Category Selection Card ---
-with st.container(border=True):
-    st.subheader("Select Filing Categories")
-    col_c1, col_c2, col_c3 = st.columns(3)
-
-    with col_c1:
-        dl_transcripts = st.checkbox("Analyst call transcripts", value=True)
-        dl_investor_pres = st.checkbox("Investor presentations", value=True)
-        dl_annual_reports = st.checkbox("Annual reports", value=True)
-        # Annual Report sub-option - flat layout for perfect alignment
-        dl_annual_reports_all = st.checkbox(
-            "All ARs (Ignore Range)",
-            value=False,
-            disabled=not dl_annual_reports
-        )
-        annual_reports_download_all = dl_annual_reports_all if dl_annual_reports else False
-
-    with col_c2:
-        dl_press_releases = st.checkbox("Press releases", value=True)
-        dl_credit_ratings = st.checkbox("Credit ratings", value=False)
-        dl_related_party = st.checkbox("Related party transactions", value=False)
-        dl_issue_docs = st.checkbox(
-            "Issue documents",
-            value=False,
-            help="IPO, Rights, QIP offer docs, info memoranda, scheme of arrangement docs.",
-        )
+@st.fragment
+def category_selection_card():
+    """Render the category checkboxes as a fragment.
+
+    Toggling a checkbox reruns only this card instead of the whole script. Values
+    are read from session state (keyed `dl_<category key>`) when Download is clicked.
+    """
+    with st.container(border=True):
+        st.subheader("Select Filing Categories")
+        col_c1, col_c2, col_c3 = st.columns(3)
+
+        with col_c1:
+            st.checkbox("Analyst call transcripts", value=True, key="dl_transcripts")
+            st.checkbox("Investor presentations", value=True, key="dl_investor_presentations")
+            dl_annual_reports = st.checkbox("Annual reports", value=True, key="dl_annual_reports")
+            # Annual Report sub-option - flat layout for perfect alignment
+            st.checkbox(
+                "All ARs (Ignore Range)",
+                value=False,
+                disabled=not dl_annual_reports,
+                key="dl_annual_reports_all",
+            )
+
+        with col_c2:
+            st.checkbox("Press releases", value=True, key="dl_press_releases")
+            st.checkbox("Credit ratings", value=False, key="dl_credit_rating")
+            st.checkbox("Related party transactions", value=False, key="dl_related_party_txns")
+            st.checkbox(
+                "Issue documents",
+                value=False,
+                help="IPO, Rights, QIP offer docs, info memoranda, scheme of arrangement docs.",
+                key="dl_issue_documents",
+            )
+
+        with col_c3:
+            # XBRL-based categories grouped logically on the right
+            st.checkbox("Change in Personnel", value=True, key="dl_personnel")
+            st.checkbox("Key announcements", value=True, key="dl_key_announcements")
+            # st.checkbox("Board Meeting Outcomes", value=True, key="dl_board_outcome")
+            st.checkbox("Shareholder Meetings", value=True, key="dl_shm")
+
+        st.write("")
+        if st.checkbox("ValuePickr Thread", value=False, key="dl_forum"):
+            st.text_input(
+                "Thread URL",
+                placeholder="https://forum.valuepickr.com/t/.../1234",
+                key="forum_url",
+            )
 
-    with col_c3:
-        # XBRL-based categories grouped logically on the right
-        dl_personnel = st.checkbox("Change in Personnel", value=True)
-        dl_key_ann = st.checkbox("Key announcements", value=True)
-        # dl_board_outcome = st.checkbox("Board Meeting Outcomes", value=True)
-        dl_shm = st.checkbox("Shareholder Meetings", value=True)
 
-    st.write("")
-    dl_forum = st.checkbox("ValuePickr Thread", value=False)
-    forum_url = ""
-    if dl_forum:
-        forum_url = st.text_input("Thread URL", placeholder="https://forum.valuepickr.com/t/.../1234")
+category_selection_card()
 
 # --- Main Action Button ---
 st.write("") # Spacer
@@ -101,72 +164,64 @@ if st.button("Download", type="primary", use_container_width=False):
     st.session_state.status_msgs = []
     st.session_state.scroll_to_results = False
 
+    # Checkboxes are keyed by category key; enabled_arg names live only in config
+    options = {
+        enabled_arg: st.session_state.get(f"dl_{cat_key}", False)
+        for cat_key, enabled_arg in ENABLED_ARG_BY_CATEGORY.items()
+    }
+    annual_reports_download_all = st.session_state.get(
+        "dl_annual_reports", False
+    ) and st.session_state.get("dl_annual_reports_all", False)
+    dl_forum = st.session_state.get("dl_forum", False)
+    forum_url = st.session_state.get("forum_url", "") if dl_forum else ""
+
     # Validation
     try:
-        service = KnowledgeService(".")
-
-        with st.spinner("Downloading and processing filings..."):
-            options = {
-                "download_transcripts": dl_transcripts,
-                "download_investor_presentations": dl_investor_pres,
-                "download_press_releases": dl_press_releases,
-                "download_credit_rating": dl_credit_ratings,
-                "download_related_party_txns": dl_related_party,
-                "download_annual_reports": dl_annual_reports,
-                "download_issue_documents": dl_issue_docs,
-                "download_personnel": dl_personnel,
-                "download_key_announcements": dl_key_ann,
-                # "download_board_outcome": dl_board_outcome,
-                "download_shm": dl_shm,
-            }
-
-            data, category_counts = service.process_request(
-                symbol=symbol,
-                from_date=from_date,
-                to_date=to_date,
-                folder_name=folder_name_input,
-                options=options,
-                annual_reports_all_mode=annual_reports_download_all,
-            )
+        # Nothing to fetch: skip symbol validation and the NSE round trips entirely
+        if not any(options.values()) and not (dl_forum and forum_url):
+            raise ValueError("Select at least one filing category to download.")
 
-            if dl_forum and forum_url:
-                client = ForumClient()
-                thread_data = client.get_full_thread(forum_url)
+        service = get_service(".")
 
-                output_dir = Path.cwd() / folder_name_input / "forum_valuepickr"
-                output_dir.mkdir(parents=True, exist_ok=True)
-                output_path = output_dir / "forum_thread.pdf"
-
-                generator = PDFGenerator()
-                generator.generate_thread_pdf(thread_data, output_path)
-
-                ref_extractor = ReferenceExtractor()
-                ref_content = ref_extractor.extract_references(thread_data)
-                ref_path = output_dir / "forum_links.md"
-                with open(ref_path, "w", encoding="utf-8") as f:
-                    f.write(ref_content)
-
-                category_counts["ValuePickr Thread"] = 1
+        with st.spinner("Downloading and processing filings..."):
+            data, category_counts = [], {}
+            # The forum export (API pages + PDF render) overlaps with the NSE downloads
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                forum_future = None
+                if dl_forum and forum_url:
+                    forum_future = executor.submit(
+                        export_forum_thread,
+                        forum_url,
+                        Path.cwd() / folder_name_input / "forum_valuepickr",
+                    )
+
+                if any(options.values()):
+                    data, category_counts = service.process_request(
+                        symbol=symbol,
+                        from_date=from_date,
+                        to_date=to_date,
+                        folder_name=folder_name_input,
+                        options=options,
+                        annual_reports_all_mode=annual_reports_download_all,
+                    )
+
+                if forum_future is not None:
+                    forum_future.result()
+                    category_counts["ValuePickr Thread"] = 1
 
             st.session_state.data = data
             st.session_state.category_counts = category_counts
 
             # constructing detailed status summary
-            processed_counts = []
-
-            for cat_key, config in DOWNLOAD_CATEGORIES_CONFIG.items():
-                label = config["label"]
-                count = category_counts.get(label, 0)
-                if count > 0:
-                    processed_counts.append(f"• {count} {pluralize(label, count)}")
-
-
-            if category_counts.get("ValuePickr Thread", 0) > 0:
-                processed_counts.append("• 1 ValuePickr Thread")
+            processed_counts = "\n\n".join(
+                f"• {count} {pluralize(label, count)}"
+                for label, count in iter_summary_counts(category_counts)
+                if count > 0
+            )
 
             summary_header = f"Successfully processed **{symbol}** filings in `{folder_name_input}`."
             if processed_counts:
-                summary_body = f"{summary_header}\n\n" + "\n\n".join(processed_counts)
+                summary_body = f"{summary_header}\n\n{processed_counts}"
             else:
                 summary_body = summary_header
 
@@ -4,18 +4,26 @@ This module provides CLI commands for batch downloading NSE company announcement
 and ValuePickr forum threads. Designed explicitly for LLM Agent consumption.
 """
 
-import json
 import logging
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 import click
 
-from knowledgelm.config import DATE_FORMAT_YMD, DOWNLOAD_CATEGORIES_CONFIG
-from knowledgelm.core.forum import ForumClient, PDFGenerator, ReferenceExtractor
-from knowledgelm.core.service import KnowledgeService
+from knowledgelm.config import (
+    DATE_FORMAT_YMD,
+    DEFAULT_FILE_EXT,
+    DOWNLOAD_CATEGORIES_CONFIG,
+    DOWNLOAD_CATEGORY_KEY_SET,
+    DOWNLOAD_CATEGORY_KEYS,
+    ENABLED_ARG_BY_CATEGORY,
+    FILE_EXTENSIONS,
+)
+from knowledgelm.utils.file_utils import dumps_json
 from knowledgelm.utils.text_utils import pluralize
 
 
@@ -37,9 +45,22 @@ def configure_logging():
 logger = logging.getLogger(__name__)
 
 
+def _error_json(message: str) -> str:
+    """Return the CLI failure payload, {"error": message, "success": false}.
+
+    Only the message needs escaping, so it is encoded on its own and spliced into
+    a fixed template rather than serializing a dict.
+    """
+    return '{"error": ' + dumps_json(message, indent=False) + ', "success": false}'
+
+
 def parse_date(date_str: str) -> datetime:
     """Parse date string in YYYY-MM-DD format."""
     try:
+        # Fixed-width fast path; anything else goes through strptime for validation
+        digits = date_str[:4] + date_str[5:7] + date_str[8:]
+        if len(date_str) == 10 and date_str[4] == date_str[7] == "-" and digits.isdecimal():
+            return datetime(int(date_str[:4]), int(date_str[5:7]), int(date_str[8:]))
         return datetime.strptime(date_str, DATE_FORMAT_YMD)
     except ValueError:
         raise click.BadParameter(f"Invalid date format: {date_str}. Use YYYY-MM-DD.")
@@ -132,30 +153,32 @@ def nse(
         end = parse_date(to_date)
     except click.BadParameter as e:
         logger.error(f"Invalid date format: {e}")
-        click.echo(json.dumps({"error": str(e), "success": False}))
+        click.echo(_error_json(str(e)))
         sys.exit(1)
 
     folder_name = output if output else f"{symbol.upper()}_sources"
 
     if datasets.lower() == "all":
-        selected_categories = list(DOWNLOAD_CATEGORIES_CONFIG.keys())
+        selected = DOWNLOAD_CATEGORY_KEY_SET
     else:
-        selected_categories = [c.strip() for c in datasets.split(",")]
+        selected = frozenset(c.strip() for c in datasets.split(","))
 
-    valid_cats = set(DOWNLOAD_CATEGORIES_CONFIG.keys())
-    invalid = set(selected_categories) - valid_cats
+    invalid = selected - DOWNLOAD_CATEGORY_KEY_SET
     if invalid:
-        msg = f"Invalid datasets: {', '.join(invalid)}. Valid: {', '.join(valid_cats)}"
+        msg = f"Invalid datasets: {', '.join(invalid)}. Valid: {', '.join(DOWNLOAD_CATEGORY_KEYS)}"
         logger.error(msg)
-        click.echo(json.dumps({"error": msg, "success": False}))
+        click.echo(_error_json(msg))
         sys.exit(1)
 
-    options = {
-        cfg["enabled_arg"]: (cat in selected_categories)
-        for cat, cfg in DOWNLOAD_CATEGORIES_CONFIG.items()
-    }
+    options = dict.fromkeys(ENABLED_ARG_BY_CATEGORY.values(), False)
+    for cat in selected:
+        options[ENABLED_ARG_BY_CATEGORY[cat]] = True
 
     try:
+        # Imported per command so `--help`, `list-datasets` and `convert` skip
+        # loading the NSE client and XBRL parser stack
+        from knowledgelm.core.service import KnowledgeService
+
         service = KnowledgeService(str(Path.cwd()))
         announcements, counts = service.process_request(
             symbol=symbol.upper(),
@@ -175,25 +198,29 @@ def nse(
             "total_filings": sum(counts.values()),
         }
 
-        click.echo(json.dumps(result, indent=2))
-
-        logger.info(f"Producing JSON result for {symbol.upper()}")
-        logger.info(f"✓ Downloaded filings for {symbol.upper()}")
-        logger.info(f"  Output: {result['output_directory']}")
-        logger.info("  Categories:")
-        for cat, count in counts.items():
-            logger.info(f"    - {count} {pluralize(cat, count)}")
-        logger.info(f"  Total: {result['total_files']} {pluralize('file', result['total_files'])}")
+        click.echo(dumps_json(result))
+
+        total = result["total_filings"]
+        # One log record for the whole summary instead of one per line
+        summary_lines = [
+            f"Producing JSON result for {symbol.upper()}",
+            f"✓ Downloaded filings for {symbol.upper()}",
+            f"  Output: {result['output_directory']}",
+            "  Categories:",
+            *(f"    - {cat}: {count} {pluralize('file', count)}" for cat, count in counts.items()),
+            f"  Total: {total} {pluralize('file', total)}",
+        ]
+        logger.info("\n".join(summary_lines))
 
-        logger.info(f"JSON Result: {json.dumps(result)}")
+        logger.info(f"JSON Result: {dumps_json(result, indent=False)}")
 
     except ValueError as e:
         logger.error(f"Value error during download: {e}")
-        click.echo(json.dumps({"error": str(e), "success": False}))
+        click.echo(_error_json(str(e)))
         sys.exit(1)
     except Exception as e:
         logger.exception("Unexpected error during download")
-        click.echo(json.dumps({"error": str(e), "success": False}))
+        click.echo(_error_json(str(e)))
         sys.exit(1)
 
 
@@ -225,10 +252,11 @@ def vp(url: str, symbol: Optional[str], output: Optional[str]):
     configure_logging()
 
     try:
+        from knowledgelm.core.forum import ForumClient, PDFGenerator, ReferenceExtractor
+
         client = ForumClient()
         logger.info(f"Fetching thread data from {url}...")
         thread_data = client.get_full_thread(url)
-        slug = client.parse_topic_url(url)[0]
 
         if symbol:
             base_folder = f"{symbol.upper()}_sources"
@@ -238,40 +266,39 @@ def vp(url: str, symbol: Optional[str], output: Optional[str]):
         if not output:
             output_dir = Path.cwd() / base_folder / "forum_valuepickr"
         else:
-            output_dir = Path(output) / "forum_valuepickr"
+            output_dir = Path(output).absolute() / "forum_valuepickr"
 
         output_dir.mkdir(parents=True, exist_ok=True)
         output_path = output_dir / "forum_thread.pdf"
 
         logger.info(f"Generating PDF with {len(thread_data['posts'])} posts...")
-        generator = PDFGenerator()
-        generator.generate_thread_pdf(thread_data, output_path)
+        with PDFGenerator() as generator:
+            generator.generate_thread_pdf(thread_data, output_path)
 
         logger.info("Extracting external references...")
         ref_extractor = ReferenceExtractor()
         ref_content = ref_extractor.extract_references(thread_data)
 
         ref_path = output_dir / "forum_links.md"
-        with open(ref_path, "w", encoding="utf-8") as f:
-            f.write(ref_content)
+        ref_path.write_text(ref_content, encoding="utf-8")
 
         result = {
             "success": True,
             "title": thread_data.get("title"),
             "posts_count": len(thread_data["posts"]),
-            "output_path": str(output_path.absolute()),
-            "references_path": str(ref_path.absolute()),
+            "output_path": str(output_path),
+            "references_path": str(ref_path),
         }
 
-        click.echo(json.dumps(result, indent=2))
+        click.echo(dumps_json(result))
 
         logger.info(f"✓ Successfully saved thread to {result['output_path']}")
         logger.info(f"✓ References extracted to {result['references_path']}")
-        logger.info(f"JSON Result: {json.dumps(result)}")
+        logger.info(f"JSON Result: {dumps_json(result, indent=False)}")
 
     except Exception as e:
         logger.exception("Failed to download forum thread")
-        click.echo(json.dumps({"error": str(e), "success": False}))
+        click.echo(_error_json(str(e)))
         sys.exit(1)
 
 
@@ -302,10 +329,10 @@ def list_datasets():
 
     result = {"datasets": datasets}
 
-    click.echo(json.dumps(result, indent=2))
+    click.echo(dumps_json(result))
 
     logger.info("Available datasets list fetched.")
-    logger.info(f"JSON Result: {json.dumps(result)}")
+    logger.info(f"JSON Result: {dumps_json(result, indent=False)}")
 
 
 @main.group()
@@ -314,8 +341,12 @@ def convert():
     pass
 
 
-def _convert_single_pdf(pdf_path: Path) -> dict:
-    """Helper to convert a single PDF using MarkItDown and return stat dict."""
+def _convert_single_pdf(pdf_path: str) -> dict:
+    """Helper to convert a single PDF using MarkItDown and return stat dict.
+
+    Callers pass an absolute path string, so the reported output path needs no
+    resolving and workers handle plain strings rather than Path objects.
+    """
     import time
 
     from markitdown import MarkItDown
@@ -323,23 +354,23 @@ def _convert_single_pdf(pdf_path: Path) -> dict:
     start_time = time.time()
     try:
         md_converter = MarkItDown()
-        result = md_converter.convert(str(pdf_path))
+        result = md_converter.convert(pdf_path)
 
-        md_path = pdf_path.with_suffix(".md")
+        md_path = os.path.splitext(pdf_path)[0] + FILE_EXTENSIONS["md"]
         with open(md_path, "w", encoding="utf-8") as f:
             f.write(result.text_content)
 
         return {
             "success": True,
-            "file": pdf_path.name,
-            "output": str(md_path.absolute()),
+            "file": os.path.basename(pdf_path),
+            "output": md_path,
             "time_seconds": round(time.time() - start_time, 2),
             "characters": len(result.text_content)
         }
     except Exception as e:
         return {
             "success": False,
-            "file": pdf_path.name,
+            "file": os.path.basename(pdf_path),
             "error": str(e),
             "time_seconds": round(time.time() - start_time, 2)
         }
@@ -363,27 +394,24 @@ def convert_file(filepath: str):
       }
     """
     configure_logging()
-    target_path = Path(filepath)
-
-    if dict(target_path.absolute().parts).get(0) == "":
-        pass # Handle root correctly on various OS if needed, but Path handles standard cases.
+    target_path = Path(filepath).absolute()
 
     if not target_path.exists():
         msg = f"File not found: {filepath}"
         logger.error(msg)
-        click.echo(json.dumps({"error": msg, "success": False}))
+        click.echo(_error_json(msg))
         sys.exit(1)
 
-    if not target_path.is_file() or target_path.suffix.lower() != ".pdf":
+    if not target_path.is_file() or target_path.suffix.lower() != DEFAULT_FILE_EXT:
         msg = f"Target must be a valid .pdf file. Received: {filepath}"
         logger.error(msg)
-        click.echo(json.dumps({"error": msg, "success": False}))
+        click.echo(_error_json(msg))
         sys.exit(1)
 
     logger.info(f"Converting PDF to Markdown: {target_path.name}")
-    result = _convert_single_pdf(target_path)
+    result = _convert_single_pdf(str(target_path))
 
-    click.echo(json.dumps(result, indent=2))
+    click.echo(dumps_json(result))
 
     if result["success"]:
         logger.info(f"✓ Converted {result['file']} in {result['time_seconds']}s")
@@ -413,46 +441,59 @@ def convert_dir(directory: str):
     """
     import time
     configure_logging()
-    target_dir = Path(directory)
+    # Resolved once; scandir entries under an absolute root carry absolute paths
+    target_dir = Path(directory).absolute()
 
     if not target_dir.exists() or not target_dir.is_dir():
         msg = f"Directory not found or invalid: {directory}"
         logger.error(msg)
-        click.echo(json.dumps({"error": msg, "success": False}))
+        click.echo(_error_json(msg))
         sys.exit(1)
 
-    pdf_files = list(target_dir.glob("*.pdf"))
+    # One scandir pass; DirEntry caches the type from the directory listing.
+    # Suffixes are matched case-insensitively, as in `convert file`.
+    with os.scandir(target_dir) as entries:
+        pdf_files = [
+            entry.path
+            for entry in entries
+            if entry.name.lower().endswith(DEFAULT_FILE_EXT) and entry.is_file()
+        ]
     if not pdf_files:
         msg = f"No .pdf {pluralize('file', 0)} found in directory: {directory}"
         logger.warning(msg)
 
-        click.echo(json.dumps({"error": msg, "success": False}))
+        click.echo(_error_json(msg))
         sys.exit(1)
 
     logger.info(f"Found {len(pdf_files)} {pluralize('PDF', len(pdf_files))} in {target_dir.name}. Starting conversion...")
 
 
     start_time = time.time()
-    results = []
     success_count = 0
 
-    for pdf in pdf_files:
-        logger.info(f"Processing: {pdf.name}")
-        res = _convert_single_pdf(pdf)
-        results.append(res)
+    # PDF parsing is CPU-bound, so fan out across processes rather than threads.
+    # map() keeps results in the same order as pdf_files.
+    workers = min(os.cpu_count() or 1, len(pdf_files))
+    logger.info(f"Converting across {workers} worker process(es)")
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(_convert_single_pdf, pdf_files))
+
+    for res in results:
         if res["success"]:
             success_count += 1
+        else:
+            logger.error(f"❌ Failed to convert {res['file']}: {res.get('error')}")
 
     final_output = {
         "success": success_count > 0,
-        "directory": str(target_dir.absolute()),
+        "directory": str(target_dir),
         "converted": success_count,
         "failed": len(pdf_files) - success_count,
         "total_time_seconds": round(time.time() - start_time, 2),
         "results": results
     }
 
-    click.echo(json.dumps(final_output, indent=2))
+    click.echo(dumps_json(final_output))
     logger.info(f"Finished directory conversion. {success_count}/{len(pdf_files)} successful.")
 
 
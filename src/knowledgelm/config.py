@@ -4,14 +4,53 @@
 
 # --- System Constants ---
 ANNOUNCEMENTS_JSON_TEMPLATE = "{symbol}_announcements.json"
+# Sidecar recording url -> {file, etag, size} so re-runs can skip unchanged documents
+DOWNLOAD_MANIFEST_NAME = ".manifest.json"
 
 FILE_EXTENSIONS = {"pdf": ".pdf", "html": ".html", "htm": ".htm", "md": ".md"}
 DEFAULT_FILE_EXT = FILE_EXTENSIONS["pdf"]
+# Suffixes the NSE downloader treats as archives to extract (tuple for str.endswith)
+ARCHIVE_EXTENSIONS = (".zip", ".gz")
+# MIME type (without parameters) -> extension
+CONTENT_TYPE_EXTENSIONS = {
+    "application/pdf": FILE_EXTENSIONS["pdf"],
+    "application/x-pdf": FILE_EXTENSIONS["pdf"],
+    "text/html": FILE_EXTENSIONS["html"],
+}
 
 # --- Timeouts ---
 SCREENER_TIMEOUT = 15
+# Seconds a fetched Screener company page is reused for the same symbol
+SCREENER_PAGE_CACHE_TTL = 600
+# Seconds an NSE announcements listing is reused for the same symbol and date range
+ANNOUNCEMENTS_CACHE_TTL = 600
 DEFAULT_REQUEST_TIMEOUT = 30
 
+# --- Concurrency ---
+# Credit rating links may fall back to headless Chrome, so keep this small.
+SCREENER_MAX_WORKERS = 4
+# NSE throttles aggressive clients; keep parallel filing downloads modest.
+NSE_MAX_WORKERS = 4
+# Issue-document listing calls run while the download pool is busy, so NSE sees at
+# most NSE_MAX_WORKERS + NSE_LISTING_WORKERS requests at once; keep this share small.
+NSE_LISTING_WORKERS = 2
+# Whole-category jobs on other hosts (Screener) that run alongside the NSE pool
+BACKGROUND_TASK_WORKERS = 2
+# ValuePickr is a community-run Discourse forum; only a few post batches in flight at once
+FORUM_MAX_WORKERS = 3
+
+# --- HTTP Connection Pooling ---
+HTTP_POOL_CONNECTIONS = 8
+HTTP_POOL_MAXSIZE = 32
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUSES = [429, 500, 502, 503, 504]
+# A host is skipped for the rest of a run after this many consecutive failures in the window
+CIRCUIT_BREAKER_THRESHOLD = 5
+CIRCUIT_BREAKER_WINDOW = 60
+# Downloads at least this large are dropped from the page cache after writing
+FADVISE_MIN_BYTES = 8 << 20
+
 # --- Date Formats ---
 DATE_FORMAT_YMD = "%Y-%m-%d"
 DATE_FORMAT_DMY_HMS = "%d-%b-%Y %H:%M:%S"
@@ -27,17 +66,27 @@ NSE_XBRL_ENDPOINT = "/XBRL-announcements"
 # --- Content Filters ---
 FILTER_ANALYST_MEET = "analysts/institutional investor meet/con. call updates"
 FILTER_INVESTOR_PRESENTATION = "investor presentation"
-FILTER_PRESS_RELEASE = ["press release", "press release (revised)"]
+FILTER_PRESS_RELEASE = frozenset({"press release", "press release (revised)"})
 FILTER_CREDIT_RATING = "credit rating"
-FILTER_RELATED_PARTY_TXNS = ["related party transaction", "related party transactions"]
+FILTER_RELATED_PARTY_TXNS = frozenset({"related party transaction", "related party transactions"})
+
+# Normalized announcement description -> standard category key (one dict lookup per item).
+# Transcripts additionally require "transcript" in the attachment text.
+ANNOUNCEMENT_CATEGORY_BY_DESC = {
+    FILTER_ANALYST_MEET: "transcripts",
+    FILTER_INVESTOR_PRESENTATION: "investor_presentations",
+    **{desc: "press_releases" for desc in FILTER_PRESS_RELEASE},
+    FILTER_CREDIT_RATING: "credit_rating",
+    **{desc: "related_party_txns" for desc in FILTER_RELATED_PARTY_TXNS},
+}
 
 # --- CSS Selectors ---
 SCREENER_DOCS_SELECTOR = "div.documents.credit-ratings"
 SCREENER_LINKS_SELECTOR = "ul.list-links a[href]"
 
 # --- Download Categories ---
-# Each category has a label, an enabled_arg (for UI/Service mapping), and a filter function.
-# The filter function logic will be moved to the service/adapter layer, here we define keys.
+# Each category has a label, an enabled_arg (for UI/Service mapping), and folder metadata.
+# Announcement matching lives in ANNOUNCEMENT_CATEGORY_BY_DESC; no per-category filters here.
 
 DOWNLOAD_CATEGORIES_CONFIG = {
     "transcripts": {
@@ -111,6 +160,13 @@ DOWNLOAD_CATEGORIES_CONFIG = {
         "output_keys": ["eventType", "broadcastDateTime", "ixbrl", "local_pdf_path"],
     },
 }
+# Category keys in display order, and as a set for validating user input
+DOWNLOAD_CATEGORY_KEYS = tuple(DOWNLOAD_CATEGORIES_CONFIG)
+DOWNLOAD_CATEGORY_KEY_SET = frozenset(DOWNLOAD_CATEGORIES_CONFIG)
+# Service option name per category key, e.g. "transcripts" -> "download_transcripts"
+ENABLED_ARG_BY_CATEGORY = {
+    cat_key: cfg["enabled_arg"] for cat_key, cfg in DOWNLOAD_CATEGORIES_CONFIG.items()
+}
 
 # --- Issue Documents Config ---
 ISSUE_DOCS_CONFIG = {
@@ -7,24 +7,29 @@ import re
 import shutil
 import subprocess
 import tempfile
-import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 from urllib.parse import urlparse
 
-import requests
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.print_page_options import PrintOptions
 
-from knowledgelm.config import FORUM_BASE_URL
+from knowledgelm.config import FORUM_BASE_URL, FORUM_MAX_WORKERS
+from knowledgelm.utils.html_utils import HTML_PARSER
+from knowledgelm.utils.http_utils import create_session
 from knowledgelm.utils.log_utils import redirect_output_to_logger
 
 logger = logging.getLogger(__name__)
 
+# Discourse topic path: /t/<slug>/<topic_id>[/<post_number>...]
+_TOPIC_PATH_RE = re.compile(r"^/t/([^/]+)/(\d+)(?:/.*)?$")
+
 
 class ForumClient:
     """Client for interacting with the ValuePickr (Discourse) JSON API."""
@@ -33,8 +38,7 @@ class ForumClient:
 
     def __init__(self):
         """Initialize the forum client."""
-        self.session = requests.Session()
-        self.session.headers.update(
+        self.session = create_session(
             {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
                 "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -67,7 +71,7 @@ class ForumClient:
         # Match patterns like:
         # /t/security-and-intelligence-services/20319
         # /t/security-and-intelligence-services/20319/123
-        match = re.search(r"^/t/([^/]+)/(\d+)(?:/.*)?$", parsed_url.path)
+        match = _TOPIC_PATH_RE.search(parsed_url.path)
         if not match:
             raise ValueError(
                 f"Invalid ValuePickr URL path: {url}. Expected format: "
@@ -151,21 +155,26 @@ class ForumClient:
 
         # Discourse allows fetching posts in batches
         batch_size = 200  # Discourse usually allows larger batches for ID lookups
+        batches = [missing_ids[i : i + batch_size] for i in range(0, len(missing_ids), batch_size)]
 
-        for i in range(0, len(missing_ids), batch_size):
-            batch = missing_ids[i : i + batch_size]
+        if batches:
             logger.info(
-                f"Fetching posts {i + 1} to {min(i + batch_size, len(missing_ids))} "
-                f"of {len(missing_ids)} remaining..."
+                f"Fetching {len(missing_ids)} remaining posts in {len(batches)} batch(es)..."
             )
-
-            try:
-                new_posts = self.fetch_posts_batch(topic_id, batch)
-                all_posts.extend(new_posts)
-                # Be nice to the server
-                time.sleep(0.5)
-            except Exception as e:
-                logger.error(f"Failed to fetch batch starting at index {i}: {e}")
+            # Batches are independent GETs; a small pool keeps the load polite.
+            # Order does not matter here because posts are sorted by date below.
+            workers = min(FORUM_MAX_WORKERS, len(batches))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self.fetch_posts_batch, topic_id, batch): index * batch_size
+                    for index, batch in enumerate(batches)
+                }
+                for future in as_completed(futures):
+                    try:
+                        all_posts.extend(future.result())
+                    except Exception as e:
+                        start = futures[future]
+                        logger.error(f"Failed to fetch batch starting at index {start}: {e}")
 
         # Sort posts by creation date to ensure correct order
         all_posts.sort(key=lambda x: x.get("created_at", ""))
@@ -244,9 +253,68 @@ class PDFGenerator:
     }
     """
 
+    def __init__(self):
+        """Initialize the generator; headless Chrome is started on first use."""
+        self._driver = None
+
+    def __enter__(self) -> "PDFGenerator":
+        """Return the generator, keeping one browser alive for the block."""
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Shut down the browser when the block exits."""
+        self.close()
+
+    def _get_driver(self) -> webdriver.Chrome:
+        """Return the shared headless Chrome driver, starting it if needed.
+
+        Chrome startup takes longer than rendering a typical thread, so one browser
+        is reused for every PDF this generator renders until close() is called.
+        """
+        if self._driver is not None:
+            return self._driver
+
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--log-level=3")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
+
+        service_args = {"log_output": subprocess.DEVNULL}
+        chromedriver_path = os.environ.get("CHROMEDRIVER_PATH") or shutil.which("chromedriver")
+        if chromedriver_path:
+            logger.debug(f"Using system ChromeDriver at {chromedriver_path}")
+            service_args["executable_path"] = chromedriver_path
+        else:
+            logger.debug("System ChromeDriver not found, relying on Selenium Manager")
+
+        # Wrap selenium startup and execution
+        with redirect_output_to_logger(logger):
+            service = Service(**service_args)
+            if os.name == "nt":
+                service.creation_flags = subprocess.CREATE_NO_WINDOW
+
+            self._driver = webdriver.Chrome(service=service, options=chrome_options)
+        return self._driver
+
+    def close(self) -> None:
+        """Quit the shared Chrome driver, if one was started."""
+        driver, self._driver = self._driver, None
+        if driver:
+            # Wrap quit as well just in case
+            try:
+                with redirect_output_to_logger(logger):
+                    driver.quit()
+            except Exception:
+                pass
+
     def generate_thread_pdf(self, thread_data: Dict[str, Any], output_path: Path):
         """Generate a PDF file from the thread data.
 
+        The browser is kept for later calls; use the generator as a context manager
+        (or call close()) to shut it down.
+
         Args:
             thread_data: The dictionary returned by ForumClient.get_full_thread.
             output_path: Path to save the PDF.
@@ -254,7 +322,7 @@ class PDFGenerator:
         title = thread_data.get("title", "ValuePickr Thread")
         posts = thread_data.get("posts", [])
 
-        html_content = [
+        header = [
             "<!DOCTYPE html>",
             "<html>",
             "<head>",
@@ -269,20 +337,31 @@ class PDFGenerator:
             "<div class='thread-container'>",
         ]
 
-        for post in posts:
-            if post.get("hidden"):
-                continue
+        logger.debug("Generating PDF using Headless Chrome...")
 
-            created_at = post.get("created_at", "")
-            try:
-                dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                date_str = dt.strftime("%B %d, %Y at %I:%M %p")
-            except ValueError:
-                date_str = created_at
+        # Stream the HTML straight into the temp file, one post at a time, rather
+        # than holding every post's markup in a list and joining it into one string
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".html", delete=False, encoding="utf-8"
+        ) as f:
+            temp_html_path = f.name
+            f.write("\n".join(header))
 
-            content = post.get("cooked", "")
+            for post in posts:
+                if post.get("hidden"):
+                    continue
+
+                created_at = post.get("created_at", "")
+                try:
+                    # fromisoformat (C-implemented) accepts Discourse's trailing "Z" on 3.11+
+                    dt = datetime.fromisoformat(created_at)
+                    date_str = dt.strftime("%B %d, %Y at %I:%M %p")
+                except ValueError:
+                    date_str = created_at
+
+                content = post.get("cooked", "")
 
-            post_html = f"""
+                f.write(f"""
             <div class='post'>
                 <div class='post-header'>
                     {date_str}
@@ -291,47 +370,12 @@ class PDFGenerator:
                     {content}
                 </div>
             </div>
-            """
-            html_content.append(post_html)
+            """)
 
-        html_content.append("</div></body></html>")
-
-        full_html = "\n".join(html_content)
-
-        logger.debug("Generating PDF using Headless Chrome...")
+            f.write("\n</div></body></html>")
 
-        # Write HTML to temp file
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".html", delete=False, encoding="utf-8"
-        ) as f:
-            f.write(full_html)
-            temp_html_path = f.name
-
-        driver = None
         try:
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--log-level=3")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-logging"])
-
-            service_args = {"log_output": subprocess.DEVNULL}
-            chromedriver_path = os.environ.get("CHROMEDRIVER_PATH") or shutil.which("chromedriver")
-            if chromedriver_path:
-                logger.debug(f"Using system ChromeDriver at {chromedriver_path}")
-                service_args["executable_path"] = chromedriver_path
-            else:
-                logger.debug("System ChromeDriver not found, relying on Selenium Manager")
-
-            # Wrap selenium startup and execution
-            with redirect_output_to_logger(logger):
-                service = Service(**service_args)
-                if os.name == "nt":
-                    service.creation_flags = subprocess.CREATE_NO_WINDOW
-
-                driver = webdriver.Chrome(service=service, options=chrome_options)
-
+            driver = self._get_driver()
             logger.debug(f"Rendering {temp_html_path} via Selenium...")
 
             with redirect_output_to_logger(logger):
@@ -358,15 +402,10 @@ class PDFGenerator:
 
         except Exception as e:
             logger.error(f"PDF generation failed: {e}")
+            # Do not hand a possibly broken browser session to the next thread
+            self.close()
             raise
         finally:
-            if driver:
-                # Wrap quit as well just in case
-                try:
-                    with redirect_output_to_logger(logger):
-                        driver.quit()
-                except Exception:
-                    pass
             # Clean up temp file
             try:
                 os.unlink(temp_html_path)
@@ -399,7 +438,7 @@ class ReferenceExtractor:
             return f"# References for {title}\n\nNo external references found in this thread."
 
         # Group links by post number
-        links_by_post = {}
+        links_by_post = defaultdict(list)
         for link in links:
             # Skip internal links if flagged
             if link.get("internal") or link.get("reflection"):
@@ -413,8 +452,6 @@ class ReferenceExtractor:
             if post_num is None:
                 post_num = 0  # Global links?
 
-            if post_num not in links_by_post:
-                links_by_post[post_num] = []
             links_by_post[post_num].append(link)
 
         if not links_by_post:
@@ -439,7 +476,7 @@ class ReferenceExtractor:
             if post:
                 created_at = post.get("created_at", "")
                 try:
-                    dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+                    dt = datetime.fromisoformat(created_at)
                     date_str = dt.strftime("%b %d, %Y")
                 except ValueError:
                     date_str = created_at
@@ -494,7 +531,7 @@ class ReferenceExtractor:
             if not content:
                 continue
 
-            soup = BeautifulSoup(content, "html.parser")
+            soup = BeautifulSoup(content, HTML_PARSER)
             links = soup.find_all("a", href=True)
 
             external_links = []
@@ -523,7 +560,7 @@ class ReferenceExtractor:
                 has_refs = True
                 created_at = post.get("created_at", "")
                 try:
-                    dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+                    dt = datetime.fromisoformat(created_at)
                     date_str = dt.strftime("%b %d, %Y")
                 except ValueError:
                     date_str = created_at
@@ -1,30 +1,175 @@
 """Core service logic for KnowledgeLM."""
 
 import logging
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Callable, DefaultDict, Dict, List, Optional, Set, Tuple
 
 from knowledgelm.config import (
+    ANNOUNCEMENT_CATEGORY_BY_DESC,
+    BACKGROUND_TASK_WORKERS,
     DATE_FORMAT_DMY_DASH,
     DATE_FORMAT_DMY_HM,
     DATE_FORMAT_DMY_HMS,
     DEFAULT_FILE_EXT,
     DOWNLOAD_CATEGORIES_CONFIG,
-    FILTER_ANALYST_MEET,
-    FILTER_CREDIT_RATING,
-    FILTER_INVESTOR_PRESENTATION,
-    FILTER_PRESS_RELEASE,
-    FILTER_RELATED_PARTY_TXNS,
     ISSUE_DOCS_CONFIG,
+    NSE_LISTING_WORKERS,
+    NSE_MAX_WORKERS,
 )
 from knowledgelm.core.xbrl_harvester import XBRL_CATEGORIES, NSEXBRLHarvester
 from knowledgelm.data.nse_adapter import NSEAdapter
 from knowledgelm.data.screener_adapter import download_credit_ratings_from_screener
-from knowledgelm.utils.file_utils import generate_standard_filename, get_download_path
+from knowledgelm.utils.file_utils import (
+    generate_standard_filename,
+    get_download_path,
+    get_url_extension,
+    write_json,
+)
+from knowledgelm.utils.http_utils import HostCircuitBreaker
 
 logger = logging.getLogger(__name__)
 
+# Values NSE uses in attachment fields when no document exists
+_PLACEHOLDER_URLS = frozenset({"-", "null", "nan"})
+# Newspaper-advert PDFs (e.g. PostalBallotAd.pdf) that look like SHM notices
+_SHM_AD_SUFFIX = f"ad{DEFAULT_FILE_EXT}"
+
+
+class _DownloadScheduler:
+    """Bounded download pool shared by every category of a request.
+
+    Category handlers enqueue their documents and return immediately, so file
+    downloads for one category overlap with the API calls and XBRL parsing of
+    the next. Workers are capped at NSE_MAX_WORKERS to respect NSE rate limits,
+    and a per-host circuit breaker stops queued downloads from each waiting out
+    a timeout once NSE keeps failing.
+    """
+
+    def __init__(self, adapter: NSEAdapter, max_workers: int = NSE_MAX_WORKERS):
+        self._adapter = adapter
+        self._breaker = HostCircuitBreaker()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Whole-category jobs on other hosts (e.g. Screener) run beside the NSE pool
+        self._tasks = ThreadPoolExecutor(max_workers=BACKGROUND_TASK_WORKERS)
+        self._futures: Dict[Future, Tuple[str, str]] = {}
+        # Folder -> names already on disk or queued; each folder is scanned once per request
+        self._known_files: Dict[Path, Set[str]] = {}
+        # (folder, url) pairs already queued; revised filings often repeat an attachment
+        self._queued_urls: Set[Tuple[Path, str]] = set()
+
+    def __enter__(self) -> "_DownloadScheduler":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        for executor in (self._executor, self._tasks):
+            executor.shutdown(wait=True, cancel_futures=exc_type is not None)
+
+    def submit(self, label: str, url: str, folder: Path, file_name: str) -> None:
+        """Queue a document download, counted under `label`.
+
+        Files already present in the folder are skipped, as are destinations
+        queued earlier in this request, so two workers never write the same file.
+        A URL already queued for the same folder is not fetched a second time.
+        """
+        if (folder, url) in self._queued_urls:
+            logger.info(f"Skipping {url}: already queued for {folder.name}")
+            return
+        known = self._known_files.get(folder)
+        if known is None:
+            known = self._known_files[folder] = self._scan_folder(folder)
+        if file_name in known:
+            logger.info(f"Skipping {url}: {file_name} already exists or is queued")
+            return
+        known.add(file_name)
+        self._queued_urls.add((folder, url))
+        future = self._executor.submit(self._download, url, folder, file_name)
+        self._futures[future] = (label, url)
+
+    def submit_task(self, label: str, fn: Callable[..., int], *args: Any) -> None:
+        """Run a callable returning a document count in the background.
+
+        Used for categories served by other hosts, so they overlap with the NSE
+        downloads instead of running before or after them.
+        """
+        future = self._tasks.submit(fn, *args)
+        self._futures[future] = (label, getattr(fn, "__name__", repr(fn)))
+
+    def _download(self, url: str, folder: Path, file_name: str) -> bool:
+        """Worker body: download one document unless its host's circuit is open."""
+        if not self._breaker.allow(url):
+            logger.warning(f"Skipping {url}: host is failing repeatedly")
+            return False
+        return self._adapter.download_and_extract(url, folder, file_name, breaker=self._breaker)
+
+    @staticmethod
+    def _scan_folder(folder: Path) -> Set[str]:
+        """List the file names in a folder with a single scandir call."""
+        try:
+            with os.scandir(folder) as entries:
+                return {entry.name for entry in entries}
+        except FileNotFoundError:
+            return set()
+
+    def join(self) -> Dict[str, int]:
+        """Wait for every queued download and return success counts by label."""
+        counts: Dict[str, int] = {}
+        for future in as_completed(self._futures):
+            label, source = self._futures[future]
+            counts.setdefault(label, 0)
+            try:
+                # Downloads report success as a bool, background tasks as a count
+                counts[label] += int(future.result() or 0)
+            except Exception as e:
+                logger.error(f"Error downloading {source}: {e}")
+        self._futures.clear()
+        return counts
+
+
+@dataclass
+class _RequestContext:
+    """Per-request state shared by the category handlers."""
+
+    symbol: str
+    from_date: datetime
+    to_date: datetime
+    download_dir: Path
+    adapter: NSEAdapter
+    downloads: _DownloadScheduler
+    annual_reports_all_mode: bool = False
+    # Lazily populated caches
+    announcements: Optional[List[Dict[str, Any]]] = None
+    buckets: Optional[Dict[str, List[Dict[str, Any]]]] = None
+
+
+def _classify_announcement(item: Dict[str, Any]) -> Optional[str]:
+    """Return the standard category an announcement belongs to, if any.
+
+    The description filters are mutually exclusive, so each item is
+    normalized once and resolved with a single dict lookup.
+    """
+    if not item.get("attchmntFile"):
+        return None
+
+    desc = str(item.get("desc", "")).strip().lower()
+    category = ANNOUNCEMENT_CATEGORY_BY_DESC.get(desc)
+
+    if category == "transcripts":
+        attortext = str(item.get("attchmntText", "")).lower()
+        if "transcript" not in attortext:
+            return None
+
+    return category
+
+
+# Handlers take (ctx, cat_key, config) and return counts keyed by category or sub-type label
+CategoryHandler = Callable[[_RequestContext, str, Dict[str, Any]], Dict[str, int]]
+
 
 class KnowledgeService:
     """Service class to handle orchestration of fetching and downloading."""
@@ -41,6 +186,9 @@ class KnowledgeService:
         self.base_path = Path(base_download_path)
         # Initialize an NSEAdapter that uses the base_path as its working directory
         self.nse_adapter = NSEAdapter(self.base_path)
+        # Per-folder adapters, reused so their NSE sessions survive between requests
+        self._adapters: Dict[Path, NSEAdapter] = {}
+        self._adapters_lock = threading.Lock()
 
     def process_request(
         self,
@@ -77,155 +225,139 @@ class KnowledgeService:
             logger.error(f"Invalid folder name: {e}")
             raise
 
-        nse_adapter = NSEAdapter(download_dir)
+        nse_adapter = self._get_adapter(download_dir)
 
         # 1.5 Validate Symbol
         if not nse_adapter.validate_symbol(symbol):
             raise ValueError(f"Symbol '{symbol}' is invalid or not found on NSE.")
 
-        # 2. Lazy Fetch Announcements
-        _cached_announcements = None
-
-        def get_general_announcements() -> List[Dict[str, Any]]:
-            nonlocal _cached_announcements
-            if _cached_announcements is None:
-                _cached_announcements = nse_adapter.get_announcements(symbol, from_date, to_date)
-                logger.info(f"Fetched {len(_cached_announcements)} total announcements.")
-            return _cached_announcements
+        # Categories needing more than the announcement filter get a dedicated handler
+        handlers: Dict[str, CategoryHandler] = {
+            "annual_reports": self._process_annual_reports,
+            "credit_rating": self._process_credit_ratings,
+            "issue_documents": self._process_issue_documents,
+        }
 
         category_counts = {}
 
-        # 3. Process Categories
-        for cat_key, config in DOWNLOAD_CATEGORIES_CONFIG.items():
-            if not options.get(config["enabled_arg"], False):
-                continue
-
-            # label = config["label"]
-            # use keys since this is returned to the caller
-            label = cat_key
-            logger.info(f"Processing category: {label}")
+        # 2. Process Categories; document downloads run in the background until the join
+        with _DownloadScheduler(nse_adapter) as downloads:
+            ctx = _RequestContext(
+                symbol=symbol,
+                from_date=from_date,
+                to_date=to_date,
+                download_dir=download_dir,
+                adapter=nse_adapter,
+                downloads=downloads,
+                annual_reports_all_mode=annual_reports_all_mode,
+            )
 
-            # Special Case: Annual Reports
-            if cat_key == "annual_reports":
-                count = self._process_annual_reports(
-                    symbol, nse_adapter, download_dir, from_date, to_date, annual_reports_all_mode
-                )
-                category_counts[label] = count
-                logger.info(f"Completed {label}: {count} items.")
-                continue
+            for cat_key, config in DOWNLOAD_CATEGORIES_CONFIG.items():
+                if not options.get(config["enabled_arg"], False):
+                    continue
 
-            # Special Case: Credit Ratings
-            if cat_key == "credit_rating":
-                count = self._process_credit_ratings(
-                    symbol, get_general_announcements, nse_adapter, download_dir
-                )
-                category_counts[label] = count
-                logger.info(f"Completed {label}: {count} items.")
-                continue
+                logger.info(f"Processing category: {cat_key}")
+                if config.get("is_xbrl"):
+                    handler = self._process_xbrl_category
+                else:
+                    handler = handlers.get(cat_key, self._process_standard_category)
 
-            # Special Case: Issue Documents
-            if cat_key == "issue_documents":
-                issue_counts = self._process_issue_documents(symbol, nse_adapter, download_dir)
-                category_counts.update(issue_counts)
-                # logging handled inside _process_issue_documents per sub-type
-                continue
+                # Counts are keyed by category key (or sub-type label) for the caller
+                category_counts.update(handler(ctx, cat_key, config))
 
-            # Special Case: XBRL Categories
-            if config.get("is_xbrl"):
-                count = self._process_xbrl_category(
-                    symbol,
-                    cat_key,
-                    config["xbrl_cat"],
-                    download_dir,
-                    from_date,
-                    to_date,
-                    nse_adapter,
-                )
-                category_counts[label] = count
-                logger.info(f"Completed {label}: {count} items.")
-                continue
+            # 3. Fold in the queued downloads once they have all finished
+            for label, count in downloads.join().items():
+                category_counts[label] = category_counts.get(label, 0) + count
 
-            # Standard Categories - apply filter and download matching items
-
-            cat_folder = download_dir / config.get("folder_name", cat_key)
-            cat_folder.mkdir(parents=True, exist_ok=True)
-
-            count = 0
-            for item in get_general_announcements():
-                if self._matches_filter(cat_key, item):
-                    url = item.get("attchmntFile")
-                    if url:
-                        ext = Path(url.split("?")[0]).suffix or DEFAULT_FILE_EXT
-                        dt_str = item.get("an_dt", "")
-                        shorthand = config.get("shorthand", cat_key)
-                        file_name = f"{generate_standard_filename(dt_str, shorthand)}{ext}"
-                        if nse_adapter.download_and_extract(url, cat_folder, file_name):
-                            count += 1
-            category_counts[label] = count
+        for label, count in category_counts.items():
             logger.info(f"Completed {label}: {count} items.")
-
         logger.info(f"Processing request for {symbol} complete.")
-        return _cached_announcements or [], category_counts
+        return ctx.announcements or [], category_counts
 
-    def _matches_filter(self, category: str, item: Dict[str, Any]) -> bool:
-        """Check if an item matches the category filter."""
-        desc = str(item.get("desc", "")).strip().lower()
-        attortext = str(item.get("attchmntText", "")).lower()
-        has_file = bool(item.get("attchmntFile"))
+    def _get_adapter(self, download_dir: Path) -> NSEAdapter:
+        """Return the NSEAdapter for a download folder, creating it on first use.
 
-        if not has_file:
-            return False
+        Reusing the adapter keeps its NSE client (cookies and pooled connections)
+        warm across requests, e.g. repeated clicks in the cached Streamlit service.
+        """
+        with self._adapters_lock:
+            adapter = self._adapters.get(download_dir)
+            if adapter is None:
+                adapter = self._adapters[download_dir] = NSEAdapter(download_dir)
+            return adapter
+
+    def _get_announcements(self, ctx: _RequestContext) -> List[Dict[str, Any]]:
+        """Lazily fetch the general announcements for the request."""
+        if ctx.announcements is None:
+            ctx.announcements = ctx.adapter.get_announcements(
+                ctx.symbol, ctx.from_date, ctx.to_date
+            )
+            logger.info(f"Fetched {len(ctx.announcements)} total announcements.")
+        return ctx.announcements
+
+    def _get_category_buckets(self, ctx: _RequestContext) -> Dict[str, List[Dict[str, Any]]]:
+        """Classify every announcement in one pass instead of rescanning per category."""
+        if ctx.buckets is None:
+            buckets: DefaultDict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+            for item in self._get_announcements(ctx):
+                buckets[_classify_announcement(item)].append(item)
+            buckets.pop(None, None)
+            ctx.buckets = dict(buckets)
+        return ctx.buckets
+
+    def _process_standard_category(
+        self, ctx: _RequestContext, cat_key: str, config: Dict[str, Any]
+    ) -> Dict[str, int]:
+        """Download the announcements matching a standard description filter."""
+        items = self._get_category_buckets(ctx).get(cat_key)
+        if not items:
+            # Nothing matched: don't create an empty category folder
+            return {cat_key: 0}
 
-        if category == "transcripts":
-            return desc == FILTER_ANALYST_MEET and "transcript" in attortext
-        elif category == "investor_presentations":
-            return desc == FILTER_INVESTOR_PRESENTATION
-        elif category == "press_releases":
-            return desc in FILTER_PRESS_RELEASE
-        elif category == "credit_rating":
-            return desc == FILTER_CREDIT_RATING
-        elif category == "related_party_txns":
-            return desc in FILTER_RELATED_PARTY_TXNS
+        cat_folder = ctx.download_dir / config.get("folder_name", cat_key)
+        cat_folder.mkdir(parents=True, exist_ok=True)
+
+        shorthand = config.get("shorthand", cat_key)
+        for item in items:
+            url = item["attchmntFile"]
+            ext = get_url_extension(url)
+            dt_str = item.get("an_dt", "")
+            file_name = f"{generate_standard_filename(dt_str, shorthand)}{ext}"
+            ctx.downloads.submit(cat_key, url, cat_folder, file_name)
+        # Downloads are counted when the scheduler is joined
+        return {cat_key: 0}
 
-        return False
+    def _matches_filter(self, category: str, item: Dict[str, Any]) -> bool:
+        """Check if an item matches the category filter."""
+        return _classify_announcement(item) == category
 
     def _process_annual_reports(
-        self,
-        symbol: str,
-        adapter: NSEAdapter,
-        root_dir: Path,
-        from_date: datetime,
-        to_date: datetime,
-        all_mode: bool,
-    ) -> int:
+        self, ctx: _RequestContext, cat_key: str, config: Dict[str, Any]
+    ) -> Dict[str, int]:
         """Fetch and download annual reports for the given symbol.
 
-        Filters reports based on the provided date range unless `all_mode` is True.
+        Filters reports based on the request date range unless
+        `ctx.annual_reports_all_mode` is True.
 
         Args:
-            symbol: Stock symbol.
-            adapter: Initialized NSEAdapter instance.
-            root_dir: Root download directory for this symbol.
-            from_date: Start date for filtering.
-            to_date: End date for filtering.
-            all_mode: If True, downloads all available reports ignoring the date range.
+            ctx: Per-request state (symbol, dates, adapter, download folder).
+            cat_key: Category key ('annual_reports').
+            config: Category configuration from DOWNLOAD_CATEGORIES_CONFIG.
 
         Returns:
-            The number of annual reports downloaded.
+            Dict mapping the category key to 0; queued downloads are counted on join.
         """
-        ar_config = DOWNLOAD_CATEGORIES_CONFIG.get("annual_reports", {})
-        folder_name = ar_config.get("folder_name", "annual_reports")
-        shorthand = ar_config.get("shorthand", "AR")
-        ar_folder = root_dir / folder_name
-        ar_folder.mkdir(parents=True, exist_ok=True)
-        count = 0
+        folder_name = config.get("folder_name", "annual_reports")
+        shorthand = config.get("shorthand", "AR")
+        ar_folder = ctx.download_dir / folder_name
 
         logger.info("Fetching annual reports metadata...")
-        ar_data = adapter.get_annual_reports(symbol)
+        ar_data = ctx.adapter.get_annual_reports(ctx.symbol)
         # ar_data is {year: [docs...]} or similar structure based on legacy code
 
         if not ar_data:
-            return 0
+            return {cat_key: 0}
+        ar_folder.mkdir(parents=True, exist_ok=True)
 
         for year, docs in ar_data.items():
             for doc in docs:
@@ -244,47 +376,41 @@ class KnowledgeService:
                 except ValueError:
                     continue
 
-                if not all_mode:
-                    if yr < from_date.year or yr > to_date.year:
+                if not ctx.annual_reports_all_mode:
+                    if yr < ctx.from_date.year or yr > ctx.to_date.year:
                         continue
 
-                logger.info(f"Downloading Annual Report for {yr}...")
-                ext = Path(url.split("?")[0]).suffix or DEFAULT_FILE_EXT
+                logger.info(f"Queueing Annual Report for {yr}...")
+                ext = get_url_extension(url)
                 file_name = f"{generate_standard_filename(str(yr), shorthand)}{ext}"
-                if adapter.download_and_extract(url, ar_folder, file_name):
-                    count += 1
-        return count
+                ctx.downloads.submit(cat_key, url, ar_folder, file_name)
+        return {cat_key: 0}
 
     def _process_credit_ratings(
-        self, symbol: str, get_announcements_func: callable, adapter: NSEAdapter, root_dir: Path
-    ) -> int:
+        self, ctx: _RequestContext, cat_key: str, config: Dict[str, Any]
+    ) -> Dict[str, int]:
         """Fetch and download credit ratings from Screener.in.
 
         Screener.in is used as the sole source for credit ratings as it provides
         high-fidelity PDF conversion and historical records.
 
         Args:
-            symbol: Stock symbol.
-            get_announcements_func: Callable to get general announcements (unused,
-                kept for signature compatibility).
-            adapter: Initialized NSEAdapter.
-            root_dir: Root download directory.
+            ctx: Per-request state (symbol, dates, adapter, download folder).
+            cat_key: Category key ('credit_rating').
+            config: Category configuration from DOWNLOAD_CATEGORIES_CONFIG.
 
         Returns:
-            Number of documents downloaded.
+            Dict mapping the category key to 0; the background count is added on join.
         """
-        # 1. Try Screener (Sole Source)
-        cat_folder = root_dir / "credit_rating"  # Matches config constant value
-        cat_folder.mkdir(parents=True, exist_ok=True)
-
-        primary_count = download_credit_ratings_from_screener(symbol, root_dir)
-        return primary_count
+        # Screener is a different host, so fetch it alongside the queued NSE downloads.
+        # The Screener adapter creates the category folder itself.
+        ctx.downloads.submit_task(
+            cat_key, download_credit_ratings_from_screener, ctx.symbol, ctx.download_dir
+        )
+        return {cat_key: 0}
 
     def _process_issue_documents(
-        self,
-        symbol: str,
-        adapter: NSEAdapter,
-        root_dir: Path,
+        self, ctx: _RequestContext, cat_key: str, config: Dict[str, Any]
     ) -> Dict[str, int]:
         """Fetch and download all issue documents for a company.
 
@@ -293,51 +419,61 @@ class KnowledgeService:
         the given symbol, and downloads all available attachments.
 
         Args:
-            symbol: Stock symbol (e.g., 'HDFCBANK').
-            adapter: Initialized NSEAdapter with active session.
-            root_dir: Root download directory for this symbol.
+            ctx: Per-request state (symbol, dates, adapter, download folder).
+            cat_key: Category key ('issue_documents').
+            config: Category configuration from DOWNLOAD_CATEGORIES_CONFIG.
 
         Returns:
-            Dict mapping document type labels to download counts.
+            Dict mapping every document type label to 0; queued downloads are
+            added to these counts when the scheduler is joined.
         """
-        issue_cat_config = DOWNLOAD_CATEGORIES_CONFIG.get("issue_documents", {})
-        issue_folder_name = issue_cat_config.get("folder_name", "share_issuance_docs")
-        issue_dir = root_dir / issue_folder_name
+        symbol = ctx.symbol
+        adapter = ctx.adapter
+        issue_folder_name = config.get("folder_name", "share_issuance_docs")
+        issue_dir = ctx.download_dir / issue_folder_name
         issue_dir.mkdir(parents=True, exist_ok=True)
 
-        # Resolve company name for endpoints where symbol is unreliable
-        company_name = adapter.get_company_name(symbol)
+        # The listing endpoints are independent round trips, so fetch them together with
+        # the company name (needed where symbol is unreliable); results keep config order
+        with ThreadPoolExecutor(max_workers=NSE_LISTING_WORKERS) as executor:
+            company_future = executor.submit(adapter.get_company_name, symbol)
+            listings = list(
+                executor.map(
+                    lambda doc_config: adapter.get_issue_documents(
+                        doc_config["api_path"], doc_config["api_params"]
+                    ),
+                    ISSUE_DOCS_CONFIG.values(),
+                )
+            )
+            company_name = company_future.result()
         logger.info(f"Resolved company name for {symbol}: '{company_name}'")
 
+        # Loop invariants, normalized once for every endpoint and record
+        symbol_upper = symbol.upper()
+        company_lower = company_name.strip().lower() if company_name else ""
         counts: Dict[str, int] = {}
 
-        for doc_type, config in ISSUE_DOCS_CONFIG.items():
-            label = config["label"]
-            api_path = config["api_path"]
-            api_params = config["api_params"]
-            attachment_fields = config["attachment_fields"]
-            subfolder = config["subfolder"]
-            symbol_reliable = config["symbol_reliable"]
+        for doc_config, documents in zip(ISSUE_DOCS_CONFIG.values(), listings):
+            label = doc_config["label"]
+            attachment_fields = doc_config["attachment_fields"]
+            subfolder = doc_config["subfolder"]
+            symbol_reliable = doc_config["symbol_reliable"]
 
-            # Fetch all documents from this endpoint
-            documents = adapter.get_issue_documents(api_path, api_params)
             if not documents:
                 logger.info(f"No {label} records returned from API")
                 counts[label] = 0
                 continue
 
-            # Filter for matching records
-            company_lower = company_name.strip().lower() if company_name else ""
+            # Filter for matching records, normalizing only the field this endpoint uses
             matching = []
 
-            for doc in documents:
-                doc_symbol = str(doc.get("symbol", "")).strip().upper()
-                doc_company = str(doc.get("company", "")).strip().lower()
-
-                if symbol_reliable:
-                    if doc_symbol == symbol.upper():
+            if symbol_reliable:
+                for doc in documents:
+                    if str(doc.get("symbol", "")).strip().upper() == symbol_upper:
                         matching.append(doc)
-                elif company_lower:
+            elif company_lower:
+                for doc in documents:
+                    doc_company = str(doc.get("company", "")).strip().lower()
                     # Tightened matching: Ensure company name is a significant part of the record
                     # or matches exactly to prevent "Bank of India" matching "State Bank of India"
                     if company_lower == doc_company or (
@@ -350,59 +486,51 @@ class KnowledgeService:
                 counts[label] = 0
                 continue
 
+            # Report the label even if every attachment is a placeholder or already on disk;
+            # queued downloads are added to it when the scheduler is joined
+            logger.info(f"Found {len(matching)} {label} record(s) for {symbol}")
+            counts[label] = 0
+
             # Download attachments
             doc_folder = issue_dir / subfolder
             doc_folder.mkdir(parents=True, exist_ok=True)
 
-            count = 0
             for doc in matching:
                 for field in attachment_fields:
                     url = str(doc.get(field, "") or "").strip()
                     # Robust check for invalid placeholders and trailing dashes
-                    if not url or url.lower() in ["-", "null", "nan"] or url.endswith("/-"):
+                    if not url or url.lower() in _PLACEHOLDER_URLS or url.endswith("/-"):
                         continue
 
                     # Attempt to extract some temporal info from doc (e.g. fileDate, date_attachmnt)
                     temporal = str(doc.get("fileDate", doc.get("date_attachmnt", "")))
-                    ext = Path(url.split("?")[0]).suffix or DEFAULT_FILE_EXT
-                    shorthand = config.get("shorthand", "IssueDoc")
+                    ext = get_url_extension(url)
+                    shorthand = doc_config.get("shorthand", "IssueDoc")
                     file_name = f"{generate_standard_filename(temporal, shorthand)}{ext}"
 
-                    if adapter.download_and_extract(url, doc_folder, file_name):
-                        count += 1
-
-            counts[label] = count
-            logger.info(f"Downloaded {count} {label} file(s) for {symbol}")
+                    ctx.downloads.submit(label, url, doc_folder, file_name)
 
         return counts
 
     def _process_xbrl_category(
-        self,
-        symbol: str,
-        cat_key: str,
-        xbrl_cat: str,
-        download_dir: Path,
-        from_date: datetime,
-        to_date: datetime,
-        adapter: NSEAdapter,
-    ) -> int:
+        self, ctx: _RequestContext, cat_key: str, config: Dict[str, Any]
+    ) -> Dict[str, int]:
         """Fetch XBRL data and save it as a JSON file in the category folder."""
-        records = self.get_xbrl_data(symbol, xbrl_cat, from_date, to_date)
+        download_dir = ctx.download_dir
+        records = self.get_xbrl_data(ctx.symbol, config["xbrl_cat"], ctx.from_date, ctx.to_date)
         if not records:
-            return 0
+            return {cat_key: 0}
 
         # Special processing for Shareholder Meetings (SHM) to extract resolutions
         if cat_key == "shm":
-            self._enrich_shm_records(records, symbol, adapter, download_dir)
+            self._enrich_shm_records(records, ctx.symbol, ctx.adapter, download_dir)
 
         # Filter output fields based on configuration
-        output_keys = DOWNLOAD_CATEGORIES_CONFIG.get(cat_key, {}).get("output_keys")
+        output_keys = config.get("output_keys")
         if output_keys:
             records = [{k: r[k] for k in output_keys if k in r} for r in records]
 
         # Save to JSON
-        import json
-
         if cat_key == "personnel":
             output_file = download_dir / "personnel_changes.json"
         elif cat_key == "key_announcements":
@@ -413,10 +541,9 @@ class KnowledgeService:
             output_file = shm_dir / "shm_details.json"
         else:
             output_file = download_dir / f"{cat_key}_details.json"
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(records, f, indent=2)
+        write_json(output_file, records)
 
-        return len(records)
+        return {cat_key: len(records)}
 
     def _enrich_shm_records(
         self, records: List[Dict], symbol: str, adapter: NSEAdapter, download_dir: Path
@@ -482,6 +609,15 @@ class KnowledgeService:
             except ValueError:
                 continue
 
+        shm_config = DOWNLOAD_CATEGORIES_CONFIG.get("shm", {})
+        shorthand = shm_config.get("shorthand", "SHM")
+        # Download to shm folder instead of temp
+        shm_folder = shm_config.get("folder_name", "shareholder_meetings")
+        shm_dir = download_dir / shm_folder / "shm_notices"
+
+        # file_name -> (pdf_url, records pointing at that file)
+        notice_jobs: Dict[str, Tuple[str, List[Dict]]] = {}
+
         for record in records:
             # Check if it's a Notice
             sub_ann = record.get("subOfAnn", "")
@@ -515,7 +651,8 @@ class KnowledgeService:
 
             for cand in candidates:
                 url = cand.get("attchmntFile", "")
-                if not url or not url.lower().endswith(DEFAULT_FILE_EXT):
+                url_lower = url.lower()
+                if not url or not url_lower.endswith(DEFAULT_FILE_EXT):
                     continue
 
                 desc = cand.get("desc", "").lower()
@@ -537,7 +674,7 @@ class KnowledgeService:
                     score += 3
 
                 # Check for "Ad" in filename as a negative signal (e.g. PostalBallotAd.pdf)
-                if f"ad{DEFAULT_FILE_EXT}" in url.lower() or "_ad" in url.lower():
+                if url_lower.endswith(_SHM_AD_SUFFIX) or "_ad" in url_lower:
                     score -= 5
 
                 if score > 0:
@@ -549,32 +686,42 @@ class KnowledgeService:
                 target_pdf_url = best_candidate[1]
                 logger.info(f"Found matching PDF: {target_pdf_url}")
 
-                shm_config = DOWNLOAD_CATEGORIES_CONFIG.get("shm", {})
-                shorthand = shm_config.get("shorthand", "SHM")
-
-                # Download to shm folder instead of temp
-                shm_folder = shm_config.get("folder_name", "shareholder_meetings")
-                shm_dir = download_dir / shm_folder / "shm_notices"
-                shm_dir.mkdir(parents=True, exist_ok=True)
-
-                ext = Path(target_pdf_url.split("?")[0]).suffix or DEFAULT_FILE_EXT
+                ext = get_url_extension(target_pdf_url)
                 file_name = f"{generate_standard_filename(xbrl_dt_str, shorthand)}{ext}"
-
-                if adapter.download_and_extract(target_pdf_url, shm_dir, file_name):
-                    # The file was saved as file_name
-                    pdf_path = shm_dir / file_name
-
-                    if pdf_path.exists():
-                        try:
-                            # record["pdf_url"] = target_pdf_url
-                            record["local_pdf_path"] = str(pdf_path.absolute())
-                        except Exception as e:
-                            logger.error(f"Failed to process PDF: {e}")
-                    else:
-                        logger.error("Downloaded PDF not found.")
+                # Notices sharing a broadcast time resolve to one file; download it once
+                notice_jobs.setdefault(file_name, (target_pdf_url, []))[1].append(record)
             else:
                 logger.warning(f"No matching PDF found for SHM Notice dated {xbrl_dt}")
 
+        if not notice_jobs:
+            return
+
+        # Notice PDFs are independent, so fetch them concurrently like the category downloads
+        shm_dir.mkdir(parents=True, exist_ok=True)
+        workers = min(NSE_MAX_WORKERS, len(notice_jobs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(adapter.download_and_extract, url, shm_dir, file_name): file_name
+                for file_name, (url, _) in notice_jobs.items()
+            }
+            for future in as_completed(futures):
+                file_name = futures[future]
+                try:
+                    if not future.result():
+                        continue
+                except Exception as e:
+                    logger.error(f"Error downloading SHM notice {file_name}: {e}")
+                    continue
+
+                # The file was saved as file_name
+                pdf_path = shm_dir / file_name
+                if pdf_path.exists():
+                    local_pdf_path = str(pdf_path.absolute())
+                    for record in notice_jobs[file_name][1]:
+                        record["local_pdf_path"] = local_pdf_path
+                else:
+                    logger.error("Downloaded PDF not found.")
+
     def get_xbrl_data(
         self,
         symbol: str,
@@ -2,18 +2,44 @@
 
 import io
 import logging
+import time
 import zipfile
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+import httpx
 from nse import NSE
 
+from knowledgelm.config import ANNOUNCEMENTS_CACHE_TTL, ARCHIVE_EXTENSIONS
+from knowledgelm.utils.file_utils import release_page_cache
+from knowledgelm.utils.http_utils import HostCircuitBreaker, is_host_failure
 from knowledgelm.utils.log_utils import redirect_output_to_logger
 
 logger = logging.getLogger(__name__)
 
 
+def _record_request_error(breaker: HostCircuitBreaker, url: str, error: Exception) -> None:
+    """Record an exception raised by NSE._req against the URL's host.
+
+    NSE._req raises the builtin ConnectionError as "<url> <status>: <reason>" for
+    non-2xx responses, so the status is read back from the message: 429/5xx count
+    as host failures, while e.g. a 404 shows the host is answering. Transport
+    errors from the httpx client, timeouts and socket errors always count.
+    """
+    message = str(error)
+    if isinstance(error, ConnectionError) and message.startswith(f"{url} "):
+        status = message[len(url) + 1 :].split(":", 1)[0]
+        if status.isdigit():
+            if is_host_failure(int(status)):
+                breaker.record_failure(url)
+            else:
+                breaker.record_success(url)
+            return
+    if isinstance(error, (httpx.TransportError, OSError)):
+        breaker.record_failure(url)
+
+
 class NSEAdapter:
     """Wrapper around the NSE library to isolate dependencies."""
 
@@ -27,12 +53,22 @@ class NSEAdapter:
         # Suppress initial print if any
         with redirect_output_to_logger(logger):
             self.nse = NSE(str(download_folder), server=True)
+        # Successful symbol lookups, reused for the adapter's lifetime
+        self._valid_symbols: Set[str] = set()
+        self._company_names: Dict[str, str] = {}
+        # (symbol, from, to) -> (fetched at, announcements), reused for ANNOUNCEMENTS_CACHE_TTL
+        self._announcements: Dict[Tuple[str, datetime, datetime], Tuple[float, List]] = {}
+        # Destination folders already created, so per-file downloads skip mkdir
+        self._created_dirs: Set[Path] = set()
 
     def get_announcements(
         self, symbol: str, from_date: datetime, to_date: datetime
     ) -> List[Dict[str, Any]]:
         """Fetch announcements from NSE for a specific symbol and date range.
 
+        Non-empty results are reused for ANNOUNCEMENTS_CACHE_TTL seconds, so repeating
+        the same query on this adapter skips the NSE round trip.
+
         Args:
             symbol: Stock symbol.
             from_date: Start date for the announcements fetch.
@@ -41,16 +77,31 @@ class NSEAdapter:
         Returns:
             A list of announcement dictionaries from the NSE response.
         """
+        key = (symbol, from_date, to_date)
+        now = time.monotonic()
+        cached = self._announcements.get(key)
+        if cached and now - cached[0] < ANNOUNCEMENTS_CACHE_TTL:
+            logger.info(f"Using cached announcements for {symbol} ({from_date} to {to_date})")
+            return list(cached[1])
+
         logger.info(
             f"Fetching announcements for {symbol} ({from_date} to {to_date})..."
         )
         try:
             with redirect_output_to_logger(logger):
-                return self.nse.announcements(symbol=symbol, from_date=from_date, to_date=to_date)
+                announcements = self.nse.announcements(
+                    symbol=symbol, from_date=from_date, to_date=to_date
+                )
         except Exception as e:
             logger.error(f"Error fetching announcements for {symbol}: {e}")
             return []
 
+        if announcements:
+            self._announcements[key] = (now, announcements)
+            # Callers get their own list, so mutating it cannot alter the cached copy
+            return list(announcements)
+        return announcements
+
     def get_annual_reports(self, symbol: str) -> Dict[str, Any]:
         """Fetch annual reports metadata from NSE.
 
@@ -68,7 +119,13 @@ class NSEAdapter:
             logger.error(f"Error fetching annual reports for {symbol}: {e}")
             return {}
 
-    def download_and_extract(self, url: str, destination_folder: Path, file_name: Optional[str] = None) -> bool:
+    def download_and_extract(
+        self,
+        url: str,
+        destination_folder: Path,
+        file_name: Optional[str] = None,
+        breaker: Optional[HostCircuitBreaker] = None,
+    ) -> bool:
         """Download a document, extracting all contents if it is a ZIP archive.
 
         This uses the internal NSE session (_req) for authentication but performs
@@ -78,7 +135,10 @@ class NSEAdapter:
             url: URL of the document to download.
             destination_folder: Folder to save/extract the file into.
             file_name: Optional override for the saved filename.
-            
+            breaker: Optional circuit breaker. Only transport errors and 429/5xx
+                responses count against the host; missing documents and local
+                write errors do not.
+
         Returns:
             True if download succeeded.
         """
@@ -86,10 +146,20 @@ class NSEAdapter:
         try:
             # Ensure we have an absolute Path object and it exists
             dest_path = Path(destination_folder).absolute()
-            dest_path.mkdir(parents=True, exist_ok=True)
+            if dest_path not in self._created_dirs:
+                dest_path.mkdir(parents=True, exist_ok=True)
+                self._created_dirs.add(dest_path)
 
-            with redirect_output_to_logger(logger):
-                response = self.nse._req(url)
+            try:
+                with redirect_output_to_logger(logger):
+                    response = self.nse._req(url)
+            except Exception as e:
+                if breaker:
+                    _record_request_error(breaker, url, e)
+                raise
+
+            if breaker:
+                breaker.record_success(url)
 
             if response.status_code != 200:
                 logger.error(f"Failed to fetch {url}: Status {response.status_code}")
@@ -100,7 +170,7 @@ class NSEAdapter:
                 original_filename = "document_data"
 
             # 1. Handle ZIP mirroring
-            if original_filename.lower().endswith(".zip") or original_filename.lower().endswith(".gz"):
+            if original_filename.lower().endswith(ARCHIVE_EXTENSIONS):
                 try:
                     with zipfile.ZipFile(io.BytesIO(response.content)) as z:
                         self._safe_extract(z, dest_path)
@@ -112,7 +182,7 @@ class NSEAdapter:
             output_filename = file_name if file_name else original_filename
             output_full_path = dest_path / output_filename
             with open(output_full_path, "wb") as f:
-                f.write(response.content)
+                release_page_cache(f, f.write(response.content))
             return True
 
         except Exception as e:
@@ -183,7 +253,7 @@ class NSEAdapter:
         """Resolve a stock symbol to its full company name.
 
         Used for matching on endpoints where the symbol field is unreliable
-        (Offer Documents, Information Memorandum).
+        (Offer Documents, Information Memorandum). Resolved names are cached.
 
         Args:
             symbol: The company stock symbol (e.g., 'HDFCBANK').
@@ -191,29 +261,41 @@ class NSEAdapter:
         Returns:
             The full company name, or empty string if resolution fails.
         """
+        if symbol in self._company_names:
+            return self._company_names[symbol]
         try:
             with redirect_output_to_logger(logger):
                 meta = self.nse.equityMetaInfo(symbol)
-                return meta.get("companyName", "")
+                name = meta.get("companyName", "")
         except Exception as e:
             logger.error(f"Error resolving company name for {symbol}: {e}")
             return ""
+        if name:
+            self._company_names[symbol] = name
+        return name
 
     def validate_symbol(self, symbol: str) -> bool:
         """Check if a symbol is valid using equityQuote.
 
+        Only positive results are cached, so a transient network error is retried
+        on the next call.
+
         Args:
             symbol: The company stock symbol (e.g., 'INFY').
 
         Returns:
             True if the symbol exists/provides a quote, False otherwise.
         """
+        if symbol in self._valid_symbols:
+            return True
         try:
             with redirect_output_to_logger(logger):
                 # equityQuote returns a dict for valid symbols
                 # and raises an exception (often KeyError 'priceInfo') for invalid ones
                 quote = self.nse.equityQuote(symbol)
-                return bool(quote)
+            if quote:
+                self._valid_symbols.add(symbol)
+            return bool(quote)
         except Exception:
             # Any error during quote fetch implies invalid symbol or network issue.
             # treating as invalid for safety.
@@ -1,39 +1,59 @@
 """Adapter for fetching data from Screener.in."""
 
 import base64
+import json
 import logging
 import os
 import shutil
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Any, Dict, Optional, Tuple
 
 import requests
-from bs4 import BeautifulSoup
 
 from knowledgelm.config import (
+    CONTENT_TYPE_EXTENSIONS,
+    DEFAULT_FILE_EXT,
     DEFAULT_REQUEST_TIMEOUT,
     DOWNLOAD_CATEGORIES_CONFIG,
+    DOWNLOAD_MANIFEST_NAME,
     ICRA_BASE_RATING_URL,
     SCREENER_BASE_URL,
     SCREENER_DOCS_SELECTOR,
+    SCREENER_LINKS_SELECTOR,
+    SCREENER_MAX_WORKERS,
+    SCREENER_PAGE_CACHE_TTL,
     SCREENER_TIMEOUT,
 )
-from knowledgelm.utils.file_utils import generate_standard_filename
+from knowledgelm.utils.file_utils import generate_standard_filename, write_json
+from knowledgelm.utils.html_utils import HTML_PARSER
+from knowledgelm.utils.http_utils import (
+    HostCircuitBreaker,
+    create_session,
+    stream_response_to_file,
+)
 from knowledgelm.utils.log_utils import redirect_output_to_logger
 
-# Conditional Selenium import for HTML-to-PDF conversion
-try:
-    from selenium import webdriver
-    from selenium.webdriver.chrome.options import Options
-    from selenium.webdriver.chrome.service import Service
+logger = logging.getLogger(__name__)
 
-    SELENIUM_AVAILABLE = True
-except ImportError:
-    SELENIUM_AVAILABLE = False
+# Browser-like headers shared by every Screener session; Referer is added per symbol
+_SCREENER_HEADERS = MappingProxyType(
+    {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
+        ),
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    }
+)
 
-logger = logging.getLogger(__name__)
+# In-process cache of Screener company pages: symbol -> (fetched_at, body)
+_SCREENER_PAGE_CACHE: Dict[str, Tuple[float, bytes]] = {}
+_screener_cache_lock = threading.Lock()
 
 
 def _get_icra_pdf_url(original_url: str) -> Optional[str]:
@@ -55,8 +75,16 @@ def _get_icra_pdf_url(original_url: str) -> Optional[str]:
 
 
 def _download_with_selenium(url: str, output_path: Path) -> bool:
-    """Download page as PDF using Selenium (headless Chrome)."""
-    if not SELENIUM_AVAILABLE:
+    """Download page as PDF using Selenium (headless Chrome).
+
+    Selenium is optional and imported on first use, so importing this module
+    (and the service layer above it) does not load it.
+    """
+    try:
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+    except ImportError:
         logger.warning("Selenium not available. Cannot convert HTML to PDF for %s", url)
         return False
 
@@ -128,6 +156,209 @@ def _download_with_selenium(url: str, output_path: Path) -> bool:
                 pass
 
 
+def _extract_date_text(a) -> str:
+    """Build a filesystem-safe date label from a Screener credit rating link.
+
+    Expected HTML:
+        <a href="...">
+          Rating update
+          <div class="ink-600 smaller">
+            4 Jul from icra
+          </div>
+        </a>
+    """
+    date_div = a.find("div", class_="ink-600 smaller")
+    if date_div:
+        # Clean the text: "4 Jul from icra" -> "4_Jul_from_icra"
+        # Also remove commas or other unsafe chars
+        raw_text = date_div.get_text(strip=True)
+        safe_text = "".join(c if c.isalnum() else "_" for c in raw_text)
+        # Collapse multiple underscores
+        safe_text = "_".join(filter(None, safe_text.split("_")))
+        if safe_text:
+            return safe_text
+    return "Unknown_Date"
+
+
+def _load_manifest(folder: Path) -> Dict[str, Dict[str, Any]]:
+    """Load the url -> {file, etag, size} manifest of earlier downloads."""
+    manifest_path = folder / DOWNLOAD_MANIFEST_NAME
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else {}
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable manifest {manifest_path}: {e}")
+        return {}
+
+
+def _save_manifest(folder: Path, manifest: Dict[str, Dict[str, Any]]) -> None:
+    """Persist the download manifest next to the downloaded files."""
+    manifest_path = folder / DOWNLOAD_MANIFEST_NAME
+    try:
+        write_json(manifest_path, manifest)
+    except Exception as e:
+        logger.warning(f"Failed to write manifest {manifest_path}: {e}")
+
+
+def _is_changed_remote(session: requests.Session, target_url: str, entry: Dict[str, Any]) -> bool:
+    """Check with a HEAD request whether a previously downloaded document has changed.
+
+    Only a clear signal counts as a change: a different ETag or, when either side
+    has no ETag, a different Content-Length. A failed HEAD or a response carrying
+    neither header keeps the local copy.
+
+    Args:
+        session: Shared pooled session.
+        target_url: Resolved document URL.
+        entry: Manifest record from an earlier download.
+
+    Returns:
+        True if the server reports a different version of the document.
+    """
+    try:
+        with redirect_output_to_logger(logger):
+            head = session.head(target_url, allow_redirects=True, timeout=SCREENER_TIMEOUT)
+    except Exception as e:
+        logger.debug(f"HEAD failed for {target_url}: {e}")
+        return False
+
+    if head.status_code != 200:
+        return False
+
+    etag = head.headers.get("ETag")
+    if etag and entry.get("etag"):
+        return etag != entry["etag"]
+
+    content_length = head.headers.get("Content-Length")
+    if content_length and entry.get("size") is not None:
+        return content_length != str(entry["size"])
+
+    return False
+
+
+def _download_credit_rating_link(
+    session: requests.Session,
+    url: str,
+    file_path: Path,
+    known: Optional[Dict[str, Any]] = None,
+    breaker: Optional[HostCircuitBreaker] = None,
+) -> Optional[Dict[str, Any]]:
+    """Download a single credit rating document as PDF.
+
+    Args:
+        session: Shared pooled session carrying the request headers.
+        url: The link scraped from Screener.
+        file_path: Destination PDF path.
+        known: Manifest record if this URL was downloaded on an earlier run.
+        breaker: Optional circuit breaker shared by the run's workers.
+
+    Returns:
+        A manifest record for the saved document, or None if nothing was saved.
+    """
+    # 1. Attempt to resolve ICRA PDF link directly
+    pdf_url = _get_icra_pdf_url(url)
+    target_url = pdf_url if pdf_url else url
+
+    logger.debug(f"Processing {url} -> Target: {target_url}")
+
+    if breaker and not breaker.allow(target_url):
+        logger.warning(f"Skipping {target_url}: host is failing repeatedly")
+        return None
+
+    # A copy already on disk is kept unless the server clearly reports a new version
+    if known and file_path.is_file() and not _is_changed_remote(session, target_url, known):
+        logger.info(f"Skipping unchanged credit rating: {file_path.name}")
+        return None
+
+    # 2. Check content type (stream mode to avoid downloading big files yet)
+    try:
+        with redirect_output_to_logger(logger):
+            resp = session.get(target_url, stream=True, timeout=DEFAULT_REQUEST_TIMEOUT)
+    except requests.SSLError:
+        logger.warning(f"SSL Error for {target_url}, skipping.")
+        return None
+    except Exception as e:
+        logger.warning(f"Connection error for {target_url}: {e}")
+        if breaker:
+            breaker.record_failure(target_url)
+        return None
+
+    if breaker:
+        breaker.record_success(target_url)
+
+    mime_type = resp.headers.get("Content-Type", "").split(";", 1)[0].strip().lower()
+    record = {"file": file_path.name, "etag": resp.headers.get("ETag")}
+
+    # The filename always carries a .pdf extension: non-PDF content is
+    # converted using Selenium below.
+    if CONTENT_TYPE_EXTENSIONS.get(mime_type) == DEFAULT_FILE_EXT:
+        logger.info(f"Downloading PDF: {file_path.name}")
+        try:
+            stream_response_to_file(resp, file_path)
+        finally:
+            resp.close()
+        record["size"] = file_path.stat().st_size
+        return record
+
+    # If HTML, we want to convert to PDF using Selenium
+    resp.close()
+
+    logger.info(f"Converting HTML to PDF: {file_path.name}")
+    if _download_with_selenium(target_url, file_path):
+        # The rendered PDF says nothing about the remote page, so keep the page's own size
+        content_length = resp.headers.get("Content-Length", "")
+        if content_length.isdigit():
+            record["size"] = int(content_length)
+        return record
+    return None
+
+
+def _fetch_screener_page(session: requests.Session, symbol: str, url: str) -> Optional[bytes]:
+    """Return the Screener company page body, reusing a recent fetch for the same symbol.
+
+    Only successful responses are cached, for SCREENER_PAGE_CACHE_TTL seconds;
+    expired pages are evicted whenever a new one is stored.
+    The individual rating links are always downloaded fresh.
+
+    Args:
+        session: Pooled session used for the request.
+        symbol: The stock symbol, used as the cache key.
+        url: The Screener company page URL.
+
+    Returns:
+        The raw page bytes, or None if Screener did not return 200.
+    """
+    now = time.monotonic()
+    with _screener_cache_lock:
+        cached = _SCREENER_PAGE_CACHE.get(symbol)
+    if cached and now - cached[0] < SCREENER_PAGE_CACHE_TTL:
+        logger.info(f"Using cached Screener page for {symbol}")
+        return cached[1]
+
+    # TLS verification is enabled on the session itself (see create_session)
+    with redirect_output_to_logger(logger):
+        resp = session.get(url, timeout=SCREENER_TIMEOUT)
+
+    if resp.status_code != 200:
+        logger.warning(f"Screener.in returned {resp.status_code} for {symbol}")
+        return None
+
+    with _screener_cache_lock:
+        # Evict expired pages on insert, so a long-running app keeps only recent symbols
+        expired = [
+            key
+            for key, (fetched_at, _) in _SCREENER_PAGE_CACHE.items()
+            if now - fetched_at >= SCREENER_PAGE_CACHE_TTL
+        ]
+        for key in expired:
+            del _SCREENER_PAGE_CACHE[key]
+        _SCREENER_PAGE_CACHE[symbol] = (now, resp.content)
+    return resp.content
+
+
 def download_credit_ratings_from_screener(symbol: str, download_folder: Path) -> int:
     """Download all credit rating documents for a symbol from screener.in.
 
@@ -145,36 +376,22 @@ def download_credit_ratings_from_screener(symbol: str, download_folder: Path) ->
     """
     screener_url = SCREENER_BASE_URL.format(symbol=symbol)
     logger.info(f"Fetching credit ratings from Screener for {symbol}...")
+    # One pooled session for the Screener page and every rating link
+    session = create_session({**_SCREENER_HEADERS, "Referer": screener_url})
     try:
-        # Security Fix: verify=True (default) set.
-        with redirect_output_to_logger(logger):
-            resp = requests.get(screener_url, timeout=SCREENER_TIMEOUT, verify=True)
-
-        if resp.status_code != 200:
-            logger.warning(f"Screener.in returned {resp.status_code} for {symbol}")
+        page = _fetch_screener_page(session, symbol, screener_url)
+        if page is None:
             return 0
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        credit_ratings_div = None
+        # Imported here so loading the service layer does not pull in bs4
+        from bs4 import BeautifulSoup
 
-        # Find credit ratings section
-        divs = soup.select(SCREENER_DOCS_SELECTOR)
-        for div in divs:
-            h3 = div.find("h3")
-            if h3 and "credit ratings" in h3.text.strip().lower():
-                credit_ratings_div = div
-                break
-
-        if not credit_ratings_div:
-            logger.info("No credit ratings section found on Screener.")
-            return 0
-
-        ul = credit_ratings_div.find("ul", class_="list-links")
-        if not ul:
-            return 0
+        soup = BeautifulSoup(page, HTML_PARSER)
 
-        links = ul.find_all("a", href=True)
+        # One selector walks straight to the links inside the credit ratings section
+        links = soup.select(f"{SCREENER_DOCS_SELECTOR} {SCREENER_LINKS_SELECTOR}")
         if not links:
+            logger.info("No credit ratings section found on Screener.")
             return 0
 
         logger.info(f"Found {len(links)} credit rating links.")
@@ -185,104 +402,61 @@ def download_credit_ratings_from_screener(symbol: str, download_folder: Path) ->
         dest_folder = download_folder / folder_name
         dest_folder.mkdir(parents=True, exist_ok=True)
 
-        count = 0
-        downloaded_files = set(f.name for f in dest_folder.glob("*"))
+        # scandir yields names without building Path objects or stat-ing entries
+        with os.scandir(dest_folder) as entries:
+            downloaded_files = {entry.name for entry in entries}
 
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                "(KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36"
-            ),
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Referer": screener_url,
-        }
+        manifest = _load_manifest(dest_folder)
 
+        # Resolve filenames up front so concurrent workers never race on the same target
+        jobs = []
         for a in links:
             url = a["href"]
-            try:
-                # Extract date info for filename
-                # Expected HTML:
-                # <a href="...">
-                #   Rating update
-                #   <div class="ink-600 smaller">
-                #     4 Jul from icra
-                #   </div>
-                # </a>
-                date_text = "Unknown_Date"
-                date_div = a.find("div", class_="ink-600 smaller")
-                if date_div:
-                    # Clean the text: "4 Jul from icra" -> "4_Jul_from_icra"
-                    # Also remove commas or other unsafe chars
-                    raw_text = date_div.get_text(strip=True)
-                    safe_text = "".join(c if c.isalnum() else "_" for c in raw_text)
-                    # Collapse multiple underscores
-                    safe_text = "_".join(filter(None, safe_text.split("_")))
-                    if safe_text:
-                        date_text = safe_text
-
-                # Construct new filename prefix
-                filename = f"{generate_standard_filename(date_text, shorthand)}.pdf"
-
-                # 1. Attempt to resolve ICRA PDF link directly
-                pdf_url = _get_icra_pdf_url(url)
-                target_url = pdf_url if pdf_url else url
-
-                logger.debug(f"Processing {url} -> Target: {target_url}")
-
-                # 2. Check content type (stream mode to avoid downloading big files yet)
-                try:
-                    with redirect_output_to_logger(logger):
-                        resp = requests.get(
-                            target_url, stream=True, timeout=DEFAULT_REQUEST_TIMEOUT, verify=True, headers=headers
-                        )
-                except requests.SSLError:
-                    logger.warning(f"SSL Error for {target_url}, skipping.")
-                    continue
-                except Exception as e:
-                    logger.warning(f"Connection error for {target_url}: {e}")
-                    continue
-
-                content_type = resp.headers.get("Content-Type", "").lower()
-
-                # The generate_standard_filename created a .pdf extension as fallback.
-                # If content_type is not pdf, we still output .pdf because we convert it using Selenium later.
-                # Construct filename is already done above.
-
-                if "application/pdf" in content_type:
-                    if filename in downloaded_files:
-                        resp.close()
-                        continue
-
-                    file_path = dest_folder / filename
-                    logger.info(f"Downloading PDF: {filename}")
-
-                    with open(file_path, "wb") as f:
-                        for chunk in resp.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                    count += 1
-                    downloaded_files.add(filename)
-                    resp.close()
-                    continue
-
-                # If HTML, we want to convert to PDF using Selenium
-                resp.close()
-
+            known = manifest.get(url)
+            if known and known.get("file"):
+                # Links seen on an earlier run are revalidated with a HEAD check
+                # against the manifest instead of being skipped by name
+                filename = Path(known["file"]).name
+            else:
+                file_base = generate_standard_filename(_extract_date_text(a), shorthand)
+                filename = f"{file_base}{DEFAULT_FILE_EXT}"
                 if filename in downloaded_files:
                     continue
+            downloaded_files.add(filename)
+            jobs.append((url, dest_folder / filename))
 
-                file_path = dest_folder / filename
-
-                # Use Selenium
-                logger.info(f"Converting HTML to PDF: {filename}")
-                if _download_with_selenium(target_url, file_path):
+        count = 0
+        breaker = HostCircuitBreaker()
+        with ThreadPoolExecutor(max_workers=SCREENER_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    _download_credit_rating_link,
+                    session,
+                    url,
+                    file_path,
+                    manifest.get(url),
+                    breaker,
+                ): url
+                for url, file_path in jobs
+            }
+            for future in as_completed(futures):
+                url = futures[future]
+                try:
+                    record = future.result()
+                except Exception as e:
+                    logger.error(f"Error processing credit rating {url}: {e}")
+                    continue
+                if record:
+                    manifest[url] = record
                     count += 1
-                    downloaded_files.add(filename)
 
-            except Exception as e:
-                logger.error(f"Error processing credit rating {url}: {e}")
+        if count:
+            _save_manifest(dest_folder, manifest)
 
         return count
 
     except Exception as e:
         logger.error(f"Error fetching credit ratings page: {e}")
         return 0
+    finally:
+        session.close()
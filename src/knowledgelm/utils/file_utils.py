@@ -1,8 +1,24 @@
 """Utility functions for file handling and sanitization."""
 
 import datetime
+import json
+import os
 import re
 from pathlib import Path
+from typing import IO, Any
+
+from knowledgelm.config import DEFAULT_FILE_EXT, FADVISE_MIN_BYTES
+
+# Optional Rust-backed JSON encoder (pip install knowledgelm[speedups])
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Suffix of the last path segment, mirroring Path.suffix without building a Path per URL
+_URL_SUFFIX_RE = re.compile(r"[^/](\.[^/.]+)$")
 
 
 def sanitize_folder_name(name: str) -> str:
@@ -95,3 +111,75 @@ def generate_standard_filename(temporal_str: str, shorthand: str) -> str:
     iso_date = format_iso_date(temporal_str)
 
     return f"{iso_date}_{shorthand}"
+
+
+def get_url_extension(url: str, default: str = DEFAULT_FILE_EXT) -> str:
+    """Return the file extension of a download URL, ignoring any query string.
+
+    Args:
+        url: The document URL.
+        default: Extension used when the URL path has none.
+
+    Returns:
+        The extension including the leading dot (e.g., '.zip').
+    """
+    match = _URL_SUFFIX_RE.search(url.split("?", 1)[0])
+    return match.group(1) if match else default
+
+
+def dumps_json(data: Any, indent: bool = True) -> str:
+    """Serialize data to a JSON string, with 2-space indentation by default.
+
+    Uses orjson when installed and falls back to the standard library encoder.
+
+    Args:
+        data: JSON-serializable data.
+        indent: Whether to pretty-print with 2-space indentation.
+
+    Returns:
+        The JSON document as a string.
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option).decode("utf-8")
+    return json.dumps(data, indent=2 if indent else None)
+
+
+def write_json(file_path: Path, data: Any) -> None:
+    """Write data to a JSON file with 2-space indentation.
+
+    Uses orjson when installed, which serializes several times faster than the
+    pure-Python indenting path of the standard library encoder.
+
+    Args:
+        file_path: Destination path.
+        data: JSON-serializable data.
+    """
+    if ORJSON_AVAILABLE:
+        Path(file_path).write_bytes(
+            orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        )
+        return
+
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+def release_page_cache(f: IO[bytes], size: int) -> None:
+    """Let the kernel drop a large, just-written file from the page cache.
+
+    Downloads are written once and not read back during the run, so files of
+    FADVISE_MIN_BYTES or more are flagged POSIX_FADV_DONTNEED where supported.
+
+    Args:
+        f: The open file the data was written to.
+        size: Number of bytes written.
+    """
+    if size < FADVISE_MIN_BYTES or not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        # Flush first so the written pages are not still dirty in the buffer
+        f.flush()
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+    except (OSError, ValueError):
+        pass
@@ -0,0 +1,9 @@
+"""Utilities for HTML parsing."""
+
+# Prefer the C-backed lxml parser when installed; html.parser is the pure-Python fallback.
+try:
+    import lxml  # noqa: F401
+
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
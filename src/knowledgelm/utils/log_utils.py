@@ -3,6 +3,7 @@
 import contextlib
 import logging
 import sys
+import threading
 from typing import Generator
 
 
@@ -37,27 +38,43 @@ class StreamToLogger:
             self.linebuf = ""
 
 
+# The standard streams are process-wide, so concurrent workers share one redirect.
+_redirect_lock = threading.Lock()
+_redirect_depth = 0
+_original_streams = None
+
+
 @contextlib.contextmanager
 def redirect_output_to_logger(
     logger: logging.Logger, level: int = logging.INFO
 ) -> Generator[None, None, None]:
-    """Context manager to redirect stdout and stderr to a logger."""
-    original_stdout = sys.stdout
-    original_stderr = sys.stderr
+    """Context manager to redirect stdout and stderr to a logger.
 
-    sys.stdout = StreamToLogger(logger, level)  # type: ignore
-    sys.stderr = StreamToLogger(logger, level)  # type: ignore
+    Safe to enter from several threads at once: the first entrant installs the
+    redirect and the last one to leave restores the original streams.
+    """
+    global _redirect_depth, _original_streams
+
+    with _redirect_lock:
+        if _redirect_depth == 0:
+            _original_streams = (sys.stdout, sys.stderr)
+            sys.stdout = StreamToLogger(logger, level)  # type: ignore
+            sys.stderr = StreamToLogger(logger, level)  # type: ignore
+        _redirect_depth += 1
     try:
         yield
     finally:
-        # Flush any remaining buffer before restoring
-        if isinstance(sys.stdout, StreamToLogger):
-            sys.stdout.flush()
-        if isinstance(sys.stderr, StreamToLogger):
-            sys.stderr.flush()
-
-        sys.stdout = original_stdout
-        sys.stderr = original_stderr
+        with _redirect_lock:
+            _redirect_depth -= 1
+            if _redirect_depth == 0:
+                # Flush any remaining buffer before restoring
+                if isinstance(sys.stdout, StreamToLogger):
+                    sys.stdout.flush()
+                if isinstance(sys.stderr, StreamToLogger):
+                    sys.stderr.flush()
+
+                sys.stdout, sys.stderr = _original_streams
+                _original_streams = None
 
 # Alias for backward compatibility
 redirect_stdout_to_logger = redirect_output_to_logger
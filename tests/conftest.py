@@ -9,6 +9,11 @@ import pytest
 mock_nse_module = MagicMock()
 sys.modules["nse"] = mock_nse_module
 
+# Mock 'httpx' (installed with nse[server]); its exception types must stay catchable
+mock_httpx = MagicMock()
+mock_httpx.TransportError = type("TransportError", (Exception,), {})
+sys.modules["httpx"] = mock_httpx
+
 # Mock 'nse_xbrl_parser' library (not installed)
 mock_nse_xbrl_parser = MagicMock()
 sys.modules["nse_xbrl_parser"] = mock_nse_xbrl_parser
@@ -20,9 +25,12 @@ sys.modules["markitdown"] = mock_markitdown
 # Mock 'urllib3' library
 mock_urllib3 = MagicMock()
 sys.modules["urllib3"] = mock_urllib3
+sys.modules["urllib3.util"] = MagicMock()
+sys.modules["urllib3.util.retry"] = MagicMock()
 
 # Mock 'requests' library
 sys.modules["requests"] = MagicMock()
+sys.modules["requests.adapters"] = MagicMock()
 
 # Mock 'bs4' library
 sys.modules["bs4"] = MagicMock()
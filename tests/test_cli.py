@@ -1,10 +1,11 @@
 import json
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch
 
 from click.testing import CliRunner
 
-from knowledgelm.cli import main
+from knowledgelm.cli import main, parse_date
 
 
 def test_fetch_nse_help():
@@ -14,7 +15,7 @@ def test_fetch_nse_help():
     assert result.exit_code == 0
     assert "Fetch Corporate Filings and XBRL" in result.output
 
-@patch("knowledgelm.cli.KnowledgeService")
+@patch("knowledgelm.core.service.KnowledgeService")
 def test_fetch_nse_success(mock_service_cls):
     """Test successful fetch nse command execution."""
     mock_service = mock_service_cls.return_value
@@ -36,12 +37,12 @@ def test_fetch_nse_success(mock_service_cls):
         assert log_file.exists()
         content = log_file.read_text()
         assert "Downloaded filings for SYMBOL" in content
-        assert "transcript: 1 files" in content
+        assert "transcript: 1 file" in content
         assert "JSON Result:" in content
 
         mock_service.process_request.assert_called()
 
-@patch("knowledgelm.cli.KnowledgeService")
+@patch("knowledgelm.core.service.KnowledgeService")
 def test_fetch_nse_all_datasets(mock_service_cls):
     """Test fetch nse with all datasets (default)."""
     mock_service = mock_service_cls.return_value
@@ -57,7 +58,7 @@ def test_fetch_nse_all_datasets(mock_service_cls):
         # Ensure all options are True
         assert all(options.values())
 
-@patch("knowledgelm.cli.KnowledgeService")
+@patch("knowledgelm.core.service.KnowledgeService")
 def test_fetch_nse_invalid_date(mock_service_cls):
     """Test invalid date format error."""
     runner = CliRunner()
@@ -77,7 +78,7 @@ def test_fetch_nse_invalid_date(mock_service_cls):
         content = log_file.read_text()
         assert "Invalid date format" in content
 
-@patch("knowledgelm.cli.KnowledgeService")
+@patch("knowledgelm.core.service.KnowledgeService")
 def test_fetch_nse_invalid_dataset(mock_service_cls):
     """Test invalid dataset input error."""
     runner = CliRunner()
@@ -97,7 +98,7 @@ def test_fetch_nse_invalid_dataset(mock_service_cls):
         content = log_file.read_text()
         assert "Invalid datasets" in content
 
-@patch("knowledgelm.cli.KnowledgeService")
+@patch("knowledgelm.core.service.KnowledgeService")
 def test_fetch_nse_unexpected_error(mock_service_cls):
     """Test unexpected error handling during fetch nse."""
     mock_service = mock_service_cls.return_value
@@ -120,6 +121,11 @@ def test_fetch_nse_unexpected_error(mock_service_cls):
         content = log_file.read_text()
         assert "Unexpected error during download" in content
 
+def test_parse_date_formats():
+    """Test fixed-width and unpadded YYYY-MM-DD dates parse to the same day."""
+    assert parse_date("2024-01-31") == datetime(2024, 1, 31)
+    assert parse_date("2024-1-31") == datetime(2024, 1, 31)
+
 def test_list_datasets():
     """Test listing datasets."""
     runner = CliRunner()
@@ -139,9 +145,9 @@ def test_list_datasets():
         assert "Available datasets list fetched." in content
         assert "JSON Result:" in content
 
-@patch("knowledgelm.cli.ForumClient")
-@patch("knowledgelm.cli.PDFGenerator")
-@patch("knowledgelm.cli.ReferenceExtractor")
+@patch("knowledgelm.core.forum.ForumClient")
+@patch("knowledgelm.core.forum.PDFGenerator")
+@patch("knowledgelm.core.forum.ReferenceExtractor")
 def test_fetch_vp_success(mock_extractor_cls, mock_generator_cls, mock_client_cls):
     """Test fetch vp command."""
     mock_client = mock_client_cls.return_value
@@ -149,6 +155,7 @@ def test_fetch_vp_success(mock_extractor_cls, mock_generator_cls, mock_client_cl
     mock_client.parse_topic_url.return_value = ("slug", 123)
 
     mock_generator = mock_generator_cls.return_value
+    mock_generator.__enter__.return_value = mock_generator
     mock_extractor = mock_extractor_cls.return_value
     mock_extractor.extract_references.return_value = "# References"
 
@@ -172,7 +179,7 @@ def test_fetch_vp_success(mock_extractor_cls, mock_generator_cls, mock_client_cl
         mock_client.get_full_thread.assert_called_with("http://url")
         mock_generator.generate_thread_pdf.assert_called()
 
-@patch("knowledgelm.cli.ForumClient")
+@patch("knowledgelm.core.forum.ForumClient")
 def test_fetch_vp_error(mock_client_cls):
     """Test fetch vp command error handling."""
     mock_client = mock_client_cls.return_value
@@ -116,6 +116,34 @@ def test_get_full_thread(mock_requests):
     assert thread["posts"][0]["id"] == 1
     assert thread["posts"][2]["id"] == 3
 
+def test_get_full_thread_fetches_batches_concurrently(mock_requests):
+    """Test every missing batch is fetched and a failed batch does not drop the rest."""
+    mock_get, mock_session = mock_requests
+    client = ForumClient()
+
+    missing = list(range(2, 452))  # three batches of up to 200 IDs
+    topic_resp = MagicMock()
+    topic_resp.json.return_value = {
+        "title": "Topic",
+        "post_stream": {
+            "stream": [1, *missing],
+            "posts": [{"id": 1, "created_at": "2023-01-01T00:00:00Z"}],
+        },
+    }
+
+    def fake_batch(topic_id, post_ids):
+        if post_ids[0] == 202:
+            raise RuntimeError("boom")
+        return [{"id": pid, "created_at": f"2023-01-02T00:00:{pid:05d}Z"} for pid in post_ids]
+
+    mock_session.get.return_value = topic_resp
+    with patch.object(client, "fetch_posts_batch", side_effect=fake_batch) as mock_batch:
+        thread = client.get_full_thread("https://forum.valuepickr.com/t/slug/123")
+
+    assert mock_batch.call_count == 3
+    ids = [p["id"] for p in thread["posts"]]
+    assert ids == [1, *range(2, 202), *range(402, 452)]
+
 # --- PDFGenerator Tests ---
 
 def test_generate_thread_pdf(mock_selenium_driver):
@@ -145,6 +173,21 @@ def test_generate_thread_pdf(mock_selenium_driver):
         mock_driver.print_page.assert_called()
         mock_open.assert_called()
 
+def test_pdf_generator_reuses_driver(mock_selenium_driver):
+    """Test one Chrome driver serves several PDFs and is quit on exit."""
+    mock_chrome, mock_driver = mock_selenium_driver
+    mock_driver.print_page.return_value = "dGVzdA=="
+    thread_data = {"title": "T", "posts": [{"cooked": "<p>x</p>", "created_at": ""}]}
+
+    with patch("builtins.open", new_callable=MagicMock):
+        with PDFGenerator() as generator:
+            generator.generate_thread_pdf(thread_data, Path("/tmp/a.pdf"))
+            generator.generate_thread_pdf(thread_data, Path("/tmp/b.pdf"))
+
+    mock_chrome.assert_called_once()
+    assert mock_driver.print_page.call_count == 2
+    mock_driver.quit.assert_called_once()
+
 def test_pdf_generator_driver_not_found():
     """Test PDF generation when ChromeDriver is not found."""
     # We need to unset CHROMEDRIVER_PATH env var and make shutil.which return None
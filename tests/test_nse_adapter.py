@@ -186,3 +186,59 @@ def test_get_company_name_error(mock_nse):
     result = adapter.get_company_name("SYMBOL")
 
     assert result == ""
+
+def test_symbol_lookups_cache_successes(mock_nse):
+    """Test valid symbols and company names are fetched once per adapter."""
+    adapter = NSEAdapter(Path("foo"))
+    mock_nse.equityQuote.return_value = {"priceInfo": {}}
+    mock_nse.equityMetaInfo.return_value = {"companyName": "Infosys Limited"}
+
+    assert adapter.validate_symbol("INFY") is True
+    assert adapter.validate_symbol("INFY") is True
+    assert adapter.get_company_name("INFY") == "Infosys Limited"
+    assert adapter.get_company_name("INFY") == "Infosys Limited"
+
+    mock_nse.equityQuote.assert_called_once_with("INFY")
+    mock_nse.equityMetaInfo.assert_called_once_with("INFY")
+
+def test_download_and_extract_creates_folder_once(mock_nse, tmp_path, monkeypatch):
+    """Test the destination folder is created on the first download only."""
+    adapter = NSEAdapter(Path("foo"))
+    mock_response = MagicMock()
+    mock_response.status_code = 200
+    mock_response.content = b"PDF content"
+    mock_nse._req.return_value = mock_response
+
+    mkdir_calls = []
+    original_mkdir = Path.mkdir
+
+    def tracking_mkdir(self, *args, **kwargs):
+        mkdir_calls.append(self)
+        return original_mkdir(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "mkdir", tracking_mkdir)
+    dest = tmp_path / "docs"
+
+    assert adapter.download_and_extract("http://example.com/a.pdf", dest) is True
+    assert adapter.download_and_extract("http://example.com/b.pdf", dest) is True
+
+    assert mkdir_calls == [dest]
+    assert (dest / "a.pdf").exists()
+    assert (dest / "b.pdf").exists()
+
+def test_get_announcements_cached_per_query(mock_nse):
+    """Test a repeated announcements query is served from the adapter cache."""
+    adapter = NSEAdapter(Path("foo"))
+    mock_nse.announcements.return_value = [{"desc": "test"}]
+    start_date = datetime(2023, 1, 1)
+    end_date = datetime(2023, 1, 2)
+
+    first = adapter.get_announcements("SYMBOL", start_date, end_date)
+    assert first == [{"desc": "test"}]
+    # Mutating a returned list must not leak into later cache hits
+    first.append({"desc": "extra"})
+    assert adapter.get_announcements("SYMBOL", start_date, end_date) == [{"desc": "test"}]
+    mock_nse.announcements.assert_called_once()
+
+    adapter.get_announcements("SYMBOL", start_date, datetime(2023, 1, 3))
+    assert mock_nse.announcements.call_count == 2
@@ -1,10 +1,11 @@
 from datetime import datetime
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from knowledgelm.core.service import KnowledgeService
+from knowledgelm.core.service import KnowledgeService, _DownloadScheduler
+from knowledgelm.data.nse_adapter import NSEAdapter
 
 # Helper for dates
 START_DATE = datetime(2023, 1, 1)
@@ -194,6 +195,36 @@ def test_process_issue_documents(mock_adapter_cls):
     mock_adapter.get_issue_documents.assert_called()
     mock_adapter.download_and_extract.assert_called()
 
+@patch("knowledgelm.core.service.NSEAdapter")
+def test_issue_document_listings_keep_their_config(mock_adapter_cls):
+    """Test concurrently fetched endpoint listings are matched to the right doc type."""
+    import time
+
+    mock_adapter = mock_adapter_cls.return_value
+    mock_adapter.validate_symbol.return_value = True
+    mock_adapter.get_announcements.return_value = []
+    mock_adapter.get_company_name.return_value = "Symbol Ltd"
+    mock_adapter.download_and_extract.return_value = True
+
+    def listing(api_path, api_params):
+        if api_path == "/corporates/offerdocs":
+            time.sleep(0.05)  # finish last, so order comes from config, not completion
+            return []
+        if api_path.endswith("/infomemo"):
+            return [{"company": "Symbol Ltd", "date_attachmnt": "http://example.com/memo.pdf"}]
+        return []
+
+    mock_adapter.get_issue_documents.side_effect = listing
+
+    service = KnowledgeService("/tmp")
+    _, counts = service.process_request(
+        "SYMBOL", START_DATE, END_DATE, "folder", {"download_issue_documents": True}
+    )
+
+    assert counts["Information Memorandum"] == 1
+    assert counts["Offer Documents (IPO)"] == 0
+    mock_adapter.get_company_name.assert_called_once_with("SYMBOL")
+
 def test_matches_filter():
     """Test category filtering logic."""
     service = KnowledgeService("/tmp")
@@ -289,6 +320,28 @@ def test_process_issue_documents_empty(mock_adapter_cls):
     _, counts = service.process_request("SYMBOL", START_DATE, END_DATE, "folder", options)
     assert all(v == 0 for v in counts.values())
 
+@patch("knowledgelm.core.service.NSEAdapter")
+def test_process_issue_documents_placeholder_attachments_counted(mock_adapter_cls, tmp_path):
+    """Test a matched doc type is reported as 0 when it has no downloadable attachment."""
+    mock_adapter = mock_adapter_cls.return_value
+    mock_adapter.validate_symbol.return_value = True
+    mock_adapter.get_company_name.return_value = "Symbol Ltd"
+
+    def listing(api_path, api_params):
+        if api_path.endswith("/infomemo"):
+            return [{"company": "Symbol Ltd", "date_attachmnt": "-"}]
+        return []
+
+    mock_adapter.get_issue_documents.side_effect = listing
+
+    service = KnowledgeService(str(tmp_path))
+    _, counts = service.process_request(
+        "SYMBOL", START_DATE, END_DATE, "folder", {"download_issue_documents": True}
+    )
+
+    assert counts["Information Memorandum"] == 0
+    mock_adapter.download_and_extract.assert_not_called()
+
 @patch("knowledgelm.core.service.NSEAdapter")
 def test_process_annual_reports_invalid_year(mock_adapter_cls):
     """Test annual reports with invalid year."""
@@ -307,3 +360,243 @@ def test_process_annual_reports_invalid_year(mock_adapter_cls):
         "SYMBOL", START_DATE, END_DATE, "folder", options, annual_reports_all_mode=True
     )
     assert counts["annual report"] == 0
+
+@patch("knowledgelm.core.service.NSEAdapter")
+def test_process_request_parallel_downloads_collapse_duplicates(mock_adapter_cls):
+    """Test queued downloads write each destination file only once (first queued wins)."""
+    mock_adapter = mock_adapter_cls.return_value
+    mock_adapter.validate_symbol.return_value = True
+    mock_adapter.get_announcements.return_value = [
+        {
+            "desc": "press release",
+            "attchmntFile": f"http://example.com/pr{i}.pdf",
+            "an_dt": dt,
+        }
+        for i, dt in enumerate(
+            ["01-Jan-2023 10:00:00", "01-Jan-2023 10:00:00", "02-Jan-2023 10:00:00"]
+        )
+    ]
+    mock_adapter.download_and_extract.return_value = True
+
+    service = KnowledgeService("/tmp")
+    _, counts = service.process_request(
+        "SYMBOL", START_DATE, END_DATE, "folder", {"download_press_releases": True}
+    )
+
+    assert counts["press_releases"] == 2
+    assert mock_adapter.download_and_extract.call_count == 2
+    urls = {c.args[0] for c in mock_adapter.download_and_extract.call_args_list}
+    assert urls == {"http://example.com/pr0.pdf", "http://example.com/pr2.pdf"}
+
+
+@patch("knowledgelm.core.service.NSEAdapter")
+def test_process_request_queues_downloads_across_categories(mock_adapter_cls):
+    """Test downloads from several categories share one scheduler and are counted per key."""
+    mock_adapter = mock_adapter_cls.return_value
+    mock_adapter.validate_symbol.return_value = True
+    mock_adapter.get_announcements.return_value = [
+        {
+            "desc": "press release",
+            "attchmntFile": "http://example.com/pr.pdf",
+            "an_dt": "01-Jan-2023 10:00:00",
+        },
+        {
+            "desc": "investor presentation",
+            "attchmntFile": "http://example.com/ip.pdf",
+            "an_dt": "02-Jan-2023 10:00:00",
+        },
+    ]
+    mock_adapter.download_and_extract.side_effect = lambda url, *_, **__: "pr" in url
+
+    service = KnowledgeService("/tmp")
+    _, counts = service.process_request(
+        "SYMBOL",
+        START_DATE,
+        END_DATE,
+        "folder",
+        {"download_press_releases": True, "download_investor_presentations": True},
+    )
+
+    assert counts == {"investor_presentations": 0, "press_releases": 1}
+    assert mock_adapter.get_announcements.call_count == 1
+    assert mock_adapter.download_and_extract.call_count == 2
+
+
+@patch("knowledgelm.core.service.NSEAdapter")
+def test_process_request_skips_files_already_on_disk(mock_adapter_cls, tmp_path):
+    """Test documents already present in the category folder are not downloaded again."""
+    mock_adapter = mock_adapter_cls.return_value
+    mock_adapter.validate_symbol.return_value = True
+    mock_adapter.get_announcements.return_value = [
+        {
+            "desc": "press release",
+            "attchmntFile": f"http://example.com/pr{day}.pdf",
+            "an_dt": f"0{day}-Jan-2023 10:00:00",
+        }
+        for day in (1, 2)
+    ]
+    mock_adapter.download_and_extract.return_value = True
+    existing = tmp_path / "folder" / "press_releases"
+    existing.mkdir(parents=True)
+    (existing / "2023-01-01_PR.pdf").write_bytes(b"%PDF")
+
+    service = KnowledgeService(str(tmp_path))
+    _, counts = service.process_request(
+        "SYMBOL", START_DATE, END_DATE, "folder", {"download_press_releases": True}
+    )
+
+    assert counts["press_releases"] == 1
+    mock_adapter.download_and_extract.assert_called_once()
+    assert mock_adapter.download_and_extract.call_args.args[0] == "http://example.com/pr2.pdf"
+
+
+def test_enrich_shm_records_downloads_notices_once(tmp_path):
+    """Test SHM notice PDFs are downloaded once per file and linked to every record."""
+    adapter = MagicMock()
+    adapter.get_announcements.return_value = [
+        {
+            "an_dt": "10-Jan-2023 10:00:00",
+            "desc": "Shareholders meeting",
+            "attchmntText": "Notice of postal ballot",
+            "attchmntFile": "http://example.com/notice.pdf",
+        }
+    ]
+
+    def fake_download(url, folder, file_name):
+        (folder / file_name).write_bytes(b"%PDF")
+        return True
+
+    adapter.download_and_extract.side_effect = fake_download
+    records = [
+        {"subOfAnn": "Notice of Postal Ballot", "broadcastDateTime": "10-Jan-2023 09:00:00"},
+        {"subOfAnn": "Notice of Postal Ballot", "broadcastDateTime": "10-Jan-2023 09:00:00"},
+        {"subOfAnn": "Voting Results", "broadcastDateTime": "11-Jan-2023 09:00:00"},
+    ]
+
+    KnowledgeService(str(tmp_path))._enrich_shm_records(records, "SYMBOL", adapter, tmp_path)
+
+    adapter.download_and_extract.assert_called_once()
+    expected = tmp_path / "shareholder_meetings" / "shm_notices" / "2023-01-10_SHM.pdf"
+    assert records[0]["local_pdf_path"] == str(expected.absolute())
+    assert records[1]["local_pdf_path"] == str(expected.absolute())
+    assert "local_pdf_path" not in records[2]
+
+
+@patch("knowledgelm.core.service.NSEAdapter")
+def test_process_request_reuses_adapter_per_folder(mock_adapter_cls, tmp_path):
+    """Test repeated requests for the same folder share one NSEAdapter."""
+    mock_adapter_cls.return_value.validate_symbol.return_value = True
+    service = KnowledgeService(str(tmp_path))
+    constructed = mock_adapter_cls.call_count
+
+    for _ in range(2):
+        service.process_request("SYMBOL", START_DATE, END_DATE, "folder", {})
+
+    assert mock_adapter_cls.call_count == constructed + 1
+    mock_adapter_cls.assert_called_with(tmp_path / "folder")
+
+
+@patch("knowledgelm.core.service.NSEAdapter")
+def test_process_request_skips_repeated_attachment_urls(mock_adapter_cls, tmp_path):
+    """Test an attachment repeated by a revised filing is downloaded only once."""
+    mock_adapter = mock_adapter_cls.return_value
+    mock_adapter.validate_symbol.return_value = True
+    mock_adapter.get_announcements.return_value = [
+        {
+            "desc": "press release",
+            "attchmntFile": "http://example.com/pr.pdf",
+            "an_dt": f"0{day}-Jan-2023 10:00:00",
+        }
+        for day in (1, 2)
+    ]
+    mock_adapter.download_and_extract.return_value = True
+
+    service = KnowledgeService(str(tmp_path))
+    _, counts = service.process_request(
+        "SYMBOL", START_DATE, END_DATE, "folder", {"download_press_releases": True}
+    )
+
+    assert counts["press_releases"] == 1
+    mock_adapter.download_and_extract.assert_called_once()
+
+
+@patch("knowledgelm.core.service.download_credit_ratings_from_screener")
+@patch("knowledgelm.core.service.NSEAdapter")
+def test_process_request_runs_credit_ratings_in_background(
+    mock_adapter_cls, mock_screener, tmp_path
+):
+    """Test Screener credit ratings run as a background task and are counted on join."""
+    mock_adapter_cls.return_value.validate_symbol.return_value = True
+    mock_screener.return_value = 3
+
+    service = KnowledgeService(str(tmp_path))
+    _, counts = service.process_request(
+        "SYMBOL", START_DATE, END_DATE, "folder", {"download_credit_rating": True}
+    )
+
+    assert counts == {"credit_rating": 3}
+    mock_screener.assert_called_once_with("SYMBOL", tmp_path / "folder")
+
+
+@patch("knowledgelm.core.service.NSEAdapter")
+def test_process_request_no_matches_creates_no_category_folder(mock_adapter_cls, tmp_path):
+    """Test an empty category neither downloads nor creates its folder."""
+    mock_adapter = mock_adapter_cls.return_value
+    mock_adapter.validate_symbol.return_value = True
+    mock_adapter.get_announcements.return_value = []
+
+    service = KnowledgeService(str(tmp_path))
+    _, counts = service.process_request(
+        "SYMBOL", START_DATE, END_DATE, "folder", {"download_press_releases": True}
+    )
+
+    assert counts == {"press_releases": 0}
+    assert not (tmp_path / "folder" / "press_releases").exists()
+    mock_adapter.download_and_extract.assert_not_called()
+
+
+def test_scheduler_missing_documents_do_not_open_circuit(mock_nse, tmp_path):
+    """Test 404s leave the host's circuit closed while repeated 503s open it."""
+    statuses = {f"http://nse.example/doc{i}.pdf": 404 for i in range(6)}
+    statuses["http://nse.example/ok.pdf"] = 200
+
+    def fake_req(url):
+        # NSE._req raises the builtin ConnectionError for any non-2xx response
+        status = statuses.get(url, 503)
+        if status != 200:
+            raise ConnectionError(f"{url} {status}: Error")
+        response = MagicMock()
+        response.status_code = 200
+        response.content = b"%PDF"
+        return response
+
+    mock_nse._req.side_effect = fake_req
+    adapter = NSEAdapter(tmp_path)
+
+    with _DownloadScheduler(adapter, max_workers=1) as downloads:
+        for url in statuses:
+            downloads.submit("docs", url, tmp_path, url.rsplit("/", 1)[-1])
+        assert downloads.join() == {"docs": 1}
+    assert (tmp_path / "ok.pdf").exists()
+
+    with _DownloadScheduler(adapter, max_workers=1) as downloads:
+        for i in range(8):
+            downloads.submit("docs", f"http://nse.example/down{i}.pdf", tmp_path, f"down{i}.pdf")
+        downloads.join()
+    # The circuit opens after CIRCUIT_BREAKER_THRESHOLD server errors
+    assert mock_nse._req.call_count == len(statuses) + 5
+
+
+def test_scheduler_transport_errors_open_circuit(mock_nse, tmp_path):
+    """Test httpx transport errors and timeouts count against the NSE host."""
+    import httpx
+
+    errors = [httpx.TransportError("reset"), TimeoutError("ReadTimeout")] * 4
+    mock_nse._req.side_effect = errors
+    adapter = NSEAdapter(tmp_path)
+
+    with _DownloadScheduler(adapter, max_workers=1) as downloads:
+        for i in range(len(errors)):
+            downloads.submit("docs", f"http://nse.example/doc{i}.pdf", tmp_path, f"doc{i}.pdf")
+        assert downloads.join() == {"docs": 0}
+    assert mock_nse._req.call_count == 5
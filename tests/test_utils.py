@@ -1,11 +1,24 @@
 import logging
 import sys
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 
-from knowledgelm.utils.file_utils import get_download_path, sanitize_folder_name
+from knowledgelm.utils.file_utils import (
+    dumps_json,
+    get_download_path,
+    get_url_extension,
+    release_page_cache,
+    sanitize_folder_name,
+    write_json,
+)
+from knowledgelm.utils.http_utils import (
+    HostCircuitBreaker,
+    create_session,
+    get_chunk_size,
+    stream_response_to_file,
+)
 from knowledgelm.utils.log_utils import StreamToLogger, redirect_output_to_logger
 
 
@@ -172,3 +185,114 @@ def test_redirect_output_to_logger_exception():
     assert mock_logger.log.call_count == 2
     mock_logger.log.assert_any_call(logging.INFO, "pre-exception stdout")
     mock_logger.log.assert_any_call(logging.INFO, "pre-exception stderr")
+
+
+def test_redirect_output_to_logger_nested():
+    """Test overlapping redirects restore the original streams only once all exit."""
+    mock_logger = MagicMock()
+    original_stdout = sys.stdout
+    original_stderr = sys.stderr
+
+    with redirect_output_to_logger(mock_logger):
+        outer_stdout = sys.stdout
+        with redirect_output_to_logger(mock_logger):
+            assert sys.stdout is outer_stdout
+        # Inner exit must not restore the streams while the outer redirect is active
+        assert isinstance(sys.stdout, StreamToLogger)
+
+    assert sys.stdout is original_stdout
+    assert sys.stderr is original_stderr
+
+
+def test_create_session_mounts_pooled_adapter(mock_requests):
+    """Test create_session mounts the pooled adapter, CA bundle and default headers."""
+    import requests
+
+    _, mock_session = mock_requests
+
+    session = create_session({"User-Agent": "test-agent"})
+
+    assert session is mock_session
+    mounted = [call.args[0] for call in mock_session.mount.call_args_list]
+    assert mounted == ["https://", "http://"]
+    mock_session.headers.update.assert_called_once_with({"User-Agent": "test-agent"})
+    assert mock_session.verify == requests.certs.where()
+
+
+def test_get_chunk_size_scales_with_content_length():
+    """Test chunk size grows with the reported response size."""
+    assert get_chunk_size(0) == 64 * 1024
+    assert get_chunk_size(2 * 1024 * 1024) == 512 * 1024
+    assert get_chunk_size(50 * 1024 * 1024) == 1024 * 1024
+
+
+def test_write_json_round_trip(tmp_path):
+    """Test write_json produces indented JSON that loads back unchanged."""
+    import json
+
+    data = [{"subOfAnn": "Notice", "xbrl_data": {"Name": "A", "Count": 2}}]
+    out = tmp_path / "records.json"
+
+    write_json(out, data)
+
+    assert json.loads(out.read_text(encoding="utf-8")) == data
+    assert '\n  {' in out.read_text(encoding="utf-8")
+
+
+def test_stream_response_to_file(tmp_path):
+    """Test stream_response_to_file writes every chunk to disk."""
+    response = MagicMock()
+    response.headers = {"Content-Length": "6"}
+    response.iter_content.return_value = [b"abc", b"def"]
+    out = tmp_path / "doc.pdf"
+
+    stream_response_to_file(response, out)
+
+    assert out.read_bytes() == b"abcdef"
+    response.iter_content.assert_called_once_with(chunk_size=64 * 1024)
+
+
+@patch("knowledgelm.utils.file_utils.os.posix_fadvise", create=True)
+def test_release_page_cache_only_for_large_files(mock_fadvise, tmp_path):
+    """Test only files of FADVISE_MIN_BYTES or more are released from the page cache."""
+    with open(tmp_path / "doc.pdf", "wb") as f:
+        release_page_cache(f, 1024)
+        mock_fadvise.assert_not_called()
+
+        release_page_cache(f, 8 << 20)
+        mock_fadvise.assert_called_once_with(f.fileno(), 0, 0, ANY)
+
+
+def test_get_url_extension():
+    """Test URL extension detection matches Path.suffix on the path part."""
+    assert get_url_extension("https://x.com/a/report.zip?v=1") == ".zip"
+    assert get_url_extension("https://x.com/a/report.tar.gz") == ".gz"
+    assert get_url_extension("https://x.com/a.b/report") == ".pdf"
+    assert get_url_extension("https://x.com/a/.hidden") == ".pdf"
+    assert get_url_extension("https://x.com/a/report.", default=".html") == ".html"
+
+
+def test_host_circuit_breaker_opens_per_host():
+    """Test the breaker trips after consecutive failures and resets on success."""
+    breaker = HostCircuitBreaker(threshold=2, window=60)
+    bad = "https://bad.example.com/a.pdf"
+
+    breaker.record_failure(bad)
+    assert breaker.allow(bad)
+    breaker.record_failure("https://bad.example.com/b.pdf")
+    assert not breaker.allow(bad)
+    assert breaker.allow("https://good.example.com/a.pdf")
+
+    breaker.record_success(bad)
+    assert breaker.allow(bad)
+
+
+def test_dumps_json_indent_and_compact():
+    """Test dumps_json pretty-prints by default and can emit compact JSON."""
+    import json
+
+    data = {"success": True, "downloads": {"shm": 2}}
+
+    assert json.loads(dumps_json(data)) == data
+    assert "\n  " in dumps_json(data)
+    assert "\n" not in dumps_json(data, indent=False)